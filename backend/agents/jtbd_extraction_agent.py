@@ -4,7 +4,6 @@ import json
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import uuid
-from sklearn.cluster import DBSCAN
 import numpy as np
 from ..core.service_factories import ServiceManager
 from ..base_agent import BaseAgent, AgentState
@@ -100,7 +99,9 @@ class JTBDExtractionAgent(BaseAgent):
             # Convert to numpy array
             embeddings_array = np.array(embeddings)
 
-            # Use DBSCAN for clustering (density-based)
+            # Use DBSCAN for clustering (density-based); scikit-learn is only
+            # imported once clustering actually runs
+            from sklearn.cluster import DBSCAN
             clustering = DBSCAN(eps=0.5, min_samples=1).fit(embeddings_array)
             labels = clustering.labels_
 
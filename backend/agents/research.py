@@ -9,7 +9,7 @@ from ..tools.competitor_ladder import CompetitorLadderTool
 from ..tools.sostac_analyzer import SOSTACAnalyzerTool
 from ..tools.evidence_db import EvidenceDBTool
 from ..tools.rtb_linker import RTBLinkerTool
-from ..utils.supabase_client import get_supabase_client
+from ..utils.supabase_client import get_supabase_client, insert_rows
 from .base_agent import BaseAgent, AgentState
 
 logger = logging.getLogger(__name__)
@@ -270,13 +270,15 @@ class ResearchAgent(BaseAgent):
         try:
             business_id = state.get("business_id")
             
+            # Nothing below reads the inserted rows back, so ask PostgREST
+            # not to return them (Prefer: return=minimal)
             # Save SOSTAC analysis
             if state.get("sostac_analysis"):
                 self.supabase.table("sostac_analyses").insert({
                     "business_id": business_id,
                     "analysis": state["sostac_analysis"],
                     "created_at": datetime.utcnow().isoformat()
-                }).execute()
+                }, returning="minimal").execute()
             
             # Save competitor ladder
             if state.get("competitor_ladder"):
@@ -284,15 +286,18 @@ class ResearchAgent(BaseAgent):
                     "business_id": business_id,
                     "ladder": state["competitor_ladder"],
                     "created_at": datetime.utcnow().isoformat()
-                }).execute()
+                }, returning="minimal").execute()
             
-            # Save evidence
-            for evidence in state.get("evidence_nodes", []):
-                self.supabase.table("evidence").insert({
+            # Save evidence in a single multi-row insert
+            created_at = datetime.utcnow().isoformat()
+            insert_rows(self.supabase, "evidence", [
+                {
                     "business_id": business_id,
                     "evidence_data": evidence,
-                    "created_at": datetime.utcnow().isoformat()
-                }).execute()
+                    "created_at": created_at
+                }
+                for evidence in state.get("evidence_nodes", [])
+            ], returning="minimal")
             
             state["status"] = "completed"
             logger.info(f"Research results saved for business {business_id}")
@@ -8,6 +8,8 @@ from typing import Dict, Any, Optional, List, AsyncGenerator
 from datetime import datetime
 import os
 
+from utils.supabase_client import get_supabase_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,8 +36,6 @@ class RaptorflowAPIClient:
 
         Returns: {business_id, subscription_tier, subscription_id}
         """
-        from utils.supabase_client import get_supabase_client
-
         supabase = get_supabase_client()
 
         try:
@@ -106,8 +106,6 @@ class RaptorflowAPIClient:
         Yields: {stage, status, progress, data}
         """
         from agents.research_v2 import research_agent
-        from utils.supabase_client import get_supabase_client
-
         supabase = get_supabase_client()
 
         try:
@@ -202,8 +200,6 @@ class RaptorflowAPIClient:
     async def generate_positioning(self, business_id: str) -> AsyncGenerator:
         """Generate 3 positioning options with streaming"""
         from agents.positioning_v2 import positioning_agent
-        from utils.supabase_client import get_supabase_client
-
         supabase = get_supabase_client()
 
         try:
@@ -273,8 +269,6 @@ class RaptorflowAPIClient:
 
     async def select_positioning(self, business_id: str, option_index: int) -> Dict[str, Any]:
         """Select a positioning option"""
-        from utils.supabase_client import get_supabase_client
-
         supabase = get_supabase_client()
 
         try:
@@ -308,8 +302,6 @@ class RaptorflowAPIClient:
     async def generate_icps(self, business_id: str, max_icps: int = 3) -> AsyncGenerator:
         """Generate ICPs with streaming"""
         from agents.icp_v2 import icp_agent
-        from utils.supabase_client import get_supabase_client
-
         supabase = get_supabase_client()
 
         try:
@@ -397,8 +389,6 @@ class RaptorflowAPIClient:
 
     async def get_business(self, business_id: str) -> Dict[str, Any]:
         """Get business details"""
-        from utils.supabase_client import get_supabase_client
-
         supabase = get_supabase_client()
 
         try:
@@ -409,8 +399,6 @@ class RaptorflowAPIClient:
 
     async def get_research_data(self, business_id: str) -> Dict[str, Any]:
         """Get research analysis"""
-        from utils.supabase_client import get_supabase_client
-
         supabase = get_supabase_client()
 
         try:
@@ -429,8 +417,6 @@ class RaptorflowAPIClient:
 
     async def get_positioning(self, business_id: str) -> Dict[str, Any]:
         """Get positioning analysis"""
-        from utils.supabase_client import get_supabase_client
-
         supabase = get_supabase_client()
 
         try:
@@ -441,8 +427,6 @@ class RaptorflowAPIClient:
 
     async def get_icps(self, business_id: str) -> Dict[str, Any]:
         """Get all ICPs for business"""
-        from utils.supabase_client import get_supabase_client
-
         supabase = get_supabase_client()
 
         try:
@@ -453,8 +437,6 @@ class RaptorflowAPIClient:
 
     async def get_subscription(self, business_id: str) -> Dict[str, Any]:
         """Get subscription tier"""
-        from utils.supabase_client import get_supabase_client
-
         supabase = get_supabase_client()
 
         try:
@@ -19,6 +19,8 @@ from pydantic import BaseModel, Field
 
 from backend.utils.conversation_manager import (
     get_conversation_manager,
+    encode_conversation_cursor,
+    decode_conversation_cursor,
     Conversation,
     Message,
 )
@@ -101,6 +103,7 @@ class ConversationListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 # ==================== Endpoints ====================
@@ -222,6 +225,7 @@ async def list_conversations(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     status: str = Query("active", description="Filter by status"),
+    before: Optional[str] = Query(None, description="next_cursor from the previous page"),
 ) -> ConversationListResponse:
     """
     List conversations for current user
@@ -230,11 +234,13 @@ async def list_conversations(
     - limit: Max conversations (1-100, default 20)
     - offset: Pagination offset (default 0)
     - status: Filter by status (active, archived, deleted)
+    - before: Cursor for the next page (preferred over offset for deep paging)
 
     **Response**: List of conversations with pagination
 
     **Status Codes**:
     - 200: Success
+    - 400: Invalid cursor
     - 401: Not authenticated
     """
     try:
@@ -244,6 +250,11 @@ async def list_conversations(
         if not user_id or not org_id:
             raise HTTPException(status_code=401, detail="Not authenticated")
 
+        try:
+            keyset = decode_conversation_cursor(before) if before else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
         manager = get_conversation_manager()
         conversations = await manager.list_conversations(
             org_id=org_id,
@@ -251,6 +262,7 @@ async def list_conversations(
             limit=limit,
             offset=offset,
             status=status,
+            before=keyset,
         )
 
         return ConversationListResponse(
@@ -260,6 +272,12 @@ async def list_conversations(
             total=len(conversations),
             limit=limit,
             offset=offset,
+            next_cursor=(
+                encode_conversation_cursor(
+                    conversations[-1].created_at, conversations[-1].id
+                )
+                if len(conversations) == limit else None
+            ),
         )
 
     except HTTPException:
@@ -317,13 +335,11 @@ async def add_message(
 
         # Verify conversation exists and belongs to user
         manager = get_conversation_manager()
-        conversation = await manager.get_conversation(
+        if not await manager.conversation_exists(
             conversation_id=conversation_id,
             user_id=user_id,
             org_id=org_id,
-        )
-
-        if not conversation:
+        ):
             raise HTTPException(
                 status_code=404,
                 detail="Conversation not found",
@@ -383,13 +399,11 @@ async def get_messages(
 
         # Verify conversation exists
         manager = get_conversation_manager()
-        conversation = await manager.get_conversation(
+        if not await manager.conversation_exists(
             conversation_id=conversation_id,
             user_id=user_id,
             org_id=org_id,
-        )
-
-        if not conversation:
+        ):
             raise HTTPException(
                 status_code=404,
                 detail="Conversation not found",
@@ -445,13 +459,11 @@ async def get_recent_messages(
 
         # Verify conversation exists
         manager = get_conversation_manager()
-        conversation = await manager.get_conversation(
+        if not await manager.conversation_exists(
             conversation_id=conversation_id,
             user_id=user_id,
             org_id=org_id,
-        )
-
-        if not conversation:
+        ):
             raise HTTPException(
                 status_code=404,
                 detail="Conversation not found",
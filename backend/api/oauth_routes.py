@@ -15,13 +15,23 @@ import logging
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Request, Response, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 from backend.utils.oauth_manager import get_oauth_manager
+from backend.utils.redis_client import (
+    get_async_redis_client,
+    dumps_cache_value,
+    loads_cache_value,
+)
 from backend.utils.supabase_client import get_supabase_client
 
 logger = logging.getLogger(__name__)
 
+# Profiles only change at signup, so /me can serve them from Redis
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "300"))
+USER_CACHE_MISS_TTL = 30
+
 router = APIRouter(
     prefix="/auth",
     tags=["auth"],
@@ -248,6 +258,38 @@ async def refresh_token(request: RefreshRequest) -> TokenResponse:
         )
 
 
+async def _get_user_profile(user_id: str) -> Optional[dict]:
+    """
+    User row by id, cached in Redis (unknown ids are cached briefly too)
+
+    Falls back to the database when Redis is unavailable.
+    """
+    cache_key = f"user:{user_id}"
+    try:
+        cached = await get_async_redis_client().get(cache_key)
+        if cached is not None:
+            return loads_cache_value(cached)
+    except Exception as e:
+        logger.debug(f"User cache read failed: {e}")
+
+    supabase = get_supabase_client()
+    user_response = await run_in_threadpool(
+        lambda: supabase.table("users").select("*").eq("id", user_id).execute()
+    )
+    user = user_response.data[0] if user_response.data else None
+
+    try:
+        await get_async_redis_client().setex(
+            cache_key,
+            USER_CACHE_TTL if user else USER_CACHE_MISS_TTL,
+            dumps_cache_value(user),
+        )
+    except Exception as e:
+        logger.debug(f"User cache write failed: {e}")
+
+    return user
+
+
 @router.get("/me")
 async def get_current_user(request: Request) -> dict:
     """
@@ -273,20 +315,14 @@ async def get_current_user(request: Request) -> dict:
                 detail="Not authenticated",
             )
 
-        # Get user from database
-        supabase = get_supabase_client()
-        user_response = supabase.table("users").select("*").eq(
-            "id", user_id
-        ).execute()
+        user = await _get_user_profile(user_id)
 
-        if not user_response.data:
+        if not user:
             raise HTTPException(
                 status_code=404,
                 detail="User not found",
             )
 
-        user = user_response.data[0]
-
         return {
             "user_id": user["id"],
             "email": user["email"],
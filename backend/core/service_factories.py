@@ -4,6 +4,7 @@ Provides centralized initialization and caching of all backend services
 """
 
 import logging
+import threading
 from typing import Optional
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -22,25 +23,44 @@ class ServiceManager:
     _llm: Optional[object] = None
     _embeddings: Optional[object] = None
 
+    # Guards first construction so concurrent callers can't build duplicates
+    _instance_lock = threading.Lock()
+    _llm_lock = threading.Lock()
+    _embeddings_lock = threading.Lock()
+
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(ServiceManager, cls).__new__(cls)
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super(ServiceManager, cls).__new__(cls)
         return cls._instance
 
     @property
     def llm(self):
         """Get or initialize the primary LLM (ChatOpenAI or ChatGoogleGenerativeAI)"""
         if self._llm is None:
-            self._llm = self._init_llm()
+            with self._llm_lock:
+                if self._llm is None:
+                    self._llm = self._init_llm()
         return self._llm
 
     @property
     def embeddings(self):
         """Get or initialize the embeddings service"""
         if self._embeddings is None:
-            self._embeddings = self._init_embeddings()
+            with self._embeddings_lock:
+                if self._embeddings is None:
+                    self._embeddings = self._init_embeddings()
         return self._embeddings
 
+    def initialize(self):
+        """Eagerly build services at startup so the first request doesn't pay for it"""
+        for name in ("llm", "embeddings"):
+            try:
+                getattr(self, name)
+            except Exception as e:
+                logger.warning(f"ServiceManager could not initialize {name}: {e}")
+
     @staticmethod
     def _init_llm():
         """Initialize the primary LLM based on configured providers"""
@@ -113,8 +133,9 @@ class ServiceManager:
 
     def reset(self):
         """Reset all cached services (useful for testing)"""
-        self._llm = None
-        self._embeddings = None
+        with self._llm_lock, self._embeddings_lock:
+            self._llm = None
+            self._embeddings = None
         logger.info("ServiceManager services reset")
 
 
@@ -1,15 +1,27 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, validator
 from typing import Optional, List
 from datetime import datetime
+import asyncio
 import os
+import time
+import json
 import logging
 import bleach
 import re
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional native JSON encoder
+    orjson = None
+
+# ORJSONResponse only fails at render time without orjson, so pick it up front
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
 # --- begin dotenv bootstrap (phase1.fix.0.6) ---
 try:
     from dotenv import load_dotenv  # add only if not already imported
@@ -46,8 +58,17 @@ from .agents.analytics import analytics_agent
 from .agents.trend_monitor import trend_monitor
 
 # Import utilities
-from .utils.supabase_client import get_supabase_client
-from .utils.razorpay_client import get_razorpay_client
+from .utils.supabase_client import get_supabase_client, insert_rows
+from .utils.razorpay_client import get_razorpay_client, verify_webhook_signature
+from .utils.redis_client import (
+    get_async_redis_client,
+    warm_async_redis_pool,
+    dumps_cache_value,
+    loads_cache_value,
+)
+from .utils.embeddings import get_chroma_client
+from .utils.conversation_manager import flush_pending_conversation_counts
+from .core.service_factories import get_service_manager
 
 # Import API routes
 from .api.budget_routes import router as budget_router
@@ -67,7 +88,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="RaptorFlow ADAPT API", 
     version="1.0.0",
-    description="AI-Powered Marketing Intelligence Platform"
+    description="AI-Powered Marketing Intelligence Platform",
+    default_response_class=DefaultJSONResponse,
 )
 
 # Add security middleware (order matters!)
@@ -82,26 +104,33 @@ if os.getenv('ENVIRONMENT') in ['production', 'staging', 'development']:
 # CORS - Production-ready configuration
 # SECURITY: Never use wildcard origins with credentials - browsers reject this
 if os.getenv('ENVIRONMENT') == 'production':
-    allowed_origins = [
+    allowed_origins = frozenset([
         os.getenv('FRONTEND_URL', 'https://app.raptorflow.in'),
         "https://raptorflow.in"
-    ]
+    ])
 else:
     # Default to explicit development origin instead of wildcard
-    allowed_origins = [
+    allowed_origins = frozenset([
         os.getenv('FRONTEND_URL', 'http://localhost:3000'),
         "http://localhost:5173",  # Vite default
         "http://127.0.0.1:3000",
         "http://127.0.0.1:5173"
-    ]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["Authorization", "Content-Type", "X-Requested-With"],
-)
+    ])
+
+# Same-origin deployments can set CORS_ENABLED=false to drop the middleware
+# (and its per-request origin check) from the stack entirely
+if os.getenv('CORS_ENABLED', 'true').lower() == 'true':
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=allowed_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["Authorization", "Content-Type", "X-Requested-With"],
+    )
+
+# Compress only payloads worth it (research/analysis JSON); level 1 costs a
+# fraction of the CPU of Starlette's default level 9 at a close ratio on JSON
+app.add_middleware(GZipMiddleware, minimum_size=4096, compresslevel=1)
 
 # Include API routes
 app.include_router(oauth_router, prefix="/api/auth", tags=["authentication"])
@@ -127,6 +156,28 @@ except Exception as e:
     logger.warning(f"Deep Research Graph initialization failed: {e}")
     logger.warning("Research features may not be available")
 
+
+@app.on_event("startup")
+async def warm_services():
+    """Build the shared clients and open Redis connections before the first request"""
+    # Independent I/O, so start-up waits for the slower of the two, not the sum
+    services_result, redis_result = await asyncio.gather(
+        run_in_threadpool(get_service_manager().initialize),
+        warm_async_redis_pool(),
+        return_exceptions=True,
+    )
+
+    if isinstance(redis_result, Exception):
+        logger.warning(f"Redis warm-up skipped: {redis_result}")
+    if isinstance(services_result, Exception):
+        raise services_result
+
+
+@app.on_event("shutdown")
+async def flush_buffered_counters():
+    """Write conversation counts still buffered in this worker"""
+    await flush_pending_conversation_counts()
+
 # ==================== ASYNC DATABASE HELPERS ====================
 
 async def async_db_query(query_fn):
@@ -137,6 +188,110 @@ async def async_db_query(query_fn):
     """
     return await run_in_threadpool(query_fn)
 
+
+SUBSCRIPTION_CACHE_TTL = int(os.getenv('SUBSCRIPTION_CACHE_TTL', '60'))
+BUSINESS_CACHE_TTL = int(os.getenv('BUSINESS_CACHE_TTL', '30'))
+CACHE_MISS_TTL = 5
+
+# Per-worker copy of the subscription (plan) row in front of Redis, so the
+# common case is a dict hit; other workers see a plan change within this TTL
+SUBSCRIPTION_LOCAL_TTL = float(os.getenv('SUBSCRIPTION_LOCAL_TTL', '5'))
+LOCAL_ROW_CACHE_MAX = 10000
+_local_row_cache: dict = {}
+
+
+def _subscription_cache_key(business_id: str) -> str:
+    return f"subscription:{business_id}"
+
+
+async def _get_cached_row(cache_key: str, ttl: int, query_fn, local_ttl: float = 0) -> Optional[dict]:
+    """
+    Single row served from Redis for a short window, else from the database.
+
+    Misses are cached briefly too, so repeated lookups for unknown ids
+    don't all reach the database. Falls back to the database if Redis is down.
+    With local_ttl, a copy is also kept in this worker for that many seconds.
+    """
+    if local_ttl:
+        now = time.monotonic()
+        entry = _local_row_cache.get(cache_key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+    data = await _load_cached_row(cache_key, ttl, query_fn)
+
+    if local_ttl:
+        if len(_local_row_cache) >= LOCAL_ROW_CACHE_MAX:
+            _local_row_cache.clear()
+        _local_row_cache[cache_key] = (now + local_ttl, data)
+    return data
+
+
+async def _load_cached_row(cache_key: str, ttl: int, query_fn) -> Optional[dict]:
+    try:
+        cached = await get_async_redis_client().get(cache_key)
+        if cached is not None:
+            return loads_cache_value(cached)
+    except Exception as e:
+        logger.debug(f"Cache read failed for {cache_key}: {e}")
+
+    result = await async_db_query(query_fn)
+    data = None if (hasattr(result, 'error') and result.error) else result.data
+
+    try:
+        await get_async_redis_client().setex(
+            cache_key, ttl if data else CACHE_MISS_TTL, dumps_cache_value(data)
+        )
+    except Exception as e:
+        logger.debug(f"Cache write failed for {cache_key}: {e}")
+
+    return data
+
+
+async def get_cached_subscription(business_id: str) -> Optional[dict]:
+    """Subscription row for a business, served from Redis for a short window."""
+    return await _get_cached_row(
+        _subscription_cache_key(business_id),
+        SUBSCRIPTION_CACHE_TTL,
+        lambda: supabase.table('subscriptions').select('*').eq('business_id', business_id).single().execute(),
+        local_ttl=SUBSCRIPTION_LOCAL_TTL,
+    )
+
+
+async def get_owned_business(business_id: str, user_id: str) -> dict:
+    """
+    Business row for a request, after verifying the caller owns it.
+
+    Businesses are not edited after intake, so the row is cached briefly and
+    repeat requests skip the ownership SELECT. Raises 404/403 HTTPExceptions.
+    """
+    business = await _get_cached_row(
+        f"business:{business_id}",
+        BUSINESS_CACHE_TTL,
+        lambda: supabase.table('businesses').select('*').eq('id', business_id).single().execute(),
+    )
+
+    if not business:
+        logger.warning(f"Business {business_id} not found or access denied for user {user_id}")
+        raise HTTPException(status_code=404, detail="Business not found")
+
+    # SECURITY: Explicit tenant ownership verification
+    # Never rely solely on RLS - verify in application layer
+    if business.get('user_id') != user_id:
+        logger.warning(f"Access denied: User {user_id} attempted to access business {business_id}")
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return business
+
+
+async def invalidate_cached_subscription(business_id: str) -> None:
+    """Drop a cached subscription row after it changes"""
+    _local_row_cache.pop(_subscription_cache_key(business_id), None)
+    try:
+        await get_async_redis_client().delete(_subscription_cache_key(business_id))
+    except Exception as e:
+        logger.warning(f"Subscription cache invalidation failed: {e}")
+
 # ==================== MODELS ====================
 
 class BusinessIntake(BaseModel):
@@ -178,9 +333,12 @@ class PerformanceSubmit(BaseModel):
 
 # ==================== ROUTES ====================
 
+# Constant for the process lifetime, so serialised once at import
+_ROOT_BODY = json.dumps({"message": "RaptorFlow ADAPT API", "status": "running"}).encode()
+
 @app.get("/")
 async def root():
-    return {"message": "RaptorFlow ADAPT API", "status": "running"}
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 # ---------- INTAKE ----------
 
@@ -204,14 +362,24 @@ async def create_business(request: Request, intake: BusinessIntake):
             except Exception:
                 pass  # Supabase auth might not be configured
         
-        # Save business (async to avoid blocking event loop)
-        result = await async_db_query(lambda: supabase.table('businesses').insert({
-            'name': intake.name,
-            'industry': intake.industry,
-            'location': intake.location,
-            'description': intake.description,
-            'goals': {'text': intake.goals},
-            'user_id': user_id  # Add user_id for RLS
+        # Save business and its trial subscription in one transaction
+        # (async to avoid blocking event loop)
+        result = await async_db_query(lambda: supabase.rpc('create_business_with_trial', {
+            'p_business': {
+                'name': intake.name,
+                'industry': intake.industry,
+                'location': intake.location,
+                'description': intake.description,
+                'goals': {'text': intake.goals},
+                'user_id': user_id  # Add user_id for RLS
+            },
+            'p_subscription': {
+                'tier': 'basic',
+                'max_icps': 3,
+                'max_moves': 5,
+                'status': 'trial',
+                'user_id': user_id  # Add user_id for RLS
+            },
         }).execute())
 
         # Check for errors and valid data
@@ -219,26 +387,12 @@ async def create_business(request: Request, intake: BusinessIntake):
             logger.error(f"Database error creating business: {result.error}")
             raise HTTPException(status_code=500, detail="Failed to create business")
 
-        if not result.data or len(result.data) == 0:
+        if not result.data:
             logger.error("Business insert returned no data")
             raise HTTPException(status_code=500, detail="Failed to create business")
 
-        business_id = result.data[0]['id']
+        business_id = result.data['id']
 
-        # Create trial subscription (async to avoid blocking event loop)
-        sub_result = await async_db_query(lambda: supabase.table('subscriptions').insert({
-            'business_id': business_id,
-            'tier': 'basic',
-            'max_icps': 3,
-            'max_moves': 5,
-            'status': 'trial',
-            'user_id': user_id  # Add user_id for RLS
-        }).execute())
-
-        if (hasattr(sub_result, 'error') and sub_result.error) or not sub_result.data:
-            logger.error(f"Database error creating subscription: {getattr(sub_result, 'error', 'No data')}")
-            raise HTTPException(status_code=500, detail="Failed to create subscription")
-        
         logger.info(f"Business created: {business_id} by user {user_id}")
         
         return {
@@ -262,22 +416,8 @@ async def run_research(request: Request, business_id: str):
     try:
         user_id = getattr(request.state, 'user_id', 'anonymous')
 
-        # Verify user owns the business - EXPLICIT ownership check (async)
-        biz = await async_db_query(
-            lambda: supabase.table('businesses').select('*').eq('id', business_id).single().execute()
-        )
-
-        # Check for errors or missing data
-        if (hasattr(biz, 'error') and biz.error) or not biz.data:
-            logger.warning(f"Business {business_id} not found or access denied for user {user_id}")
-            raise HTTPException(status_code=404, detail="Business not found")
-
-        # SECURITY: Explicit tenant ownership verification
-        # Never rely solely on RLS - verify in application layer
-        business_owner_id = biz.data.get('user_id')
-        if business_owner_id != user_id:
-            logger.warning(f"Access denied: User {user_id} attempted to access business {business_id} owned by {business_owner_id}")
-            raise HTTPException(status_code=403, detail="Access denied - you do not own this business")
+        # Verify user owns the business - EXPLICIT ownership check (cached)
+        business = await get_owned_business(business_id, user_id)
         
         # Check cost limits
         cost_control = get_cost_control()
@@ -287,7 +427,7 @@ async def run_research(request: Request, business_id: str):
         # Run research agent
         result = await research_agent.ainvoke({
             'business_id': business_id,
-            'business_data': biz.data,
+            'business_data': business,
             'evidence': [],
             'competitor_ladder': [],
             'sostac': {},
@@ -331,19 +471,23 @@ async def run_research(request: Request, business_id: str):
 async def get_research(business_id: str):
     """Get existing research data"""
     try:
-        # Get SOSTAC
-        sostac = supabase.table('sostac_analyses')\
-            .select('*')\
-            .eq('business_id', business_id)\
-            .order('created_at', desc=True)\
-            .limit(1)\
-            .execute()
-        
-        # Get competitor ladder
-        competitors = supabase.table('competitor_ladder')\
-            .select('*')\
-            .eq('business_id', business_id)\
-            .execute()
+        # Get SOSTAC and competitor ladder concurrently
+        sostac, competitors = await asyncio.gather(
+            async_db_query(
+                lambda: supabase.table('sostac_analyses')
+                .select('*')
+                .eq('business_id', business_id)
+                .order('created_at', desc=True)
+                .limit(1)
+                .execute()
+            ),
+            async_db_query(
+                lambda: supabase.table('competitor_ladder')
+                .select('*')
+                .eq('business_id', business_id)
+                .execute()
+            ),
+        )
         
         return {
             "sostac": sostac.data[0] if sostac.data else None,
@@ -361,17 +505,8 @@ async def analyze_positioning(request: Request, business_id: str):
     try:
         user_id = getattr(request.state, 'user_id', 'anonymous')
 
-        # SECURITY: Verify ownership (async)
-        biz = await async_db_query(
-            lambda: supabase.table('businesses').select('*').eq('id', business_id).single().execute()
-        )
-
-        if (hasattr(biz, 'error') and biz.error) or not biz.data:
-            raise HTTPException(status_code=404, detail="Business not found")
-
-        if biz.data.get('user_id') != user_id:
-            logger.warning(f"Access denied: User {user_id} attempted to access business {business_id}")
-            raise HTTPException(status_code=403, detail="Access denied")
+        # SECURITY: Verify ownership (cached)
+        business = await get_owned_business(business_id, user_id)
 
         comps = await async_db_query(
             lambda: supabase.table('competitor_ladder').select('*').eq('business_id', business_id).execute()
@@ -379,7 +514,7 @@ async def analyze_positioning(request: Request, business_id: str):
         
         result = await positioning_agent.ainvoke({
             'business_id': business_id,
-            'business_data': biz.data,
+            'business_data': business,
             'competitor_ladder': comps.data,
             'options': [],
             'status': 'running'
@@ -389,7 +524,7 @@ async def analyze_positioning(request: Request, business_id: str):
         supabase.table('positioning_analyses').insert({
             'business_id': business_id,
             'options': result['options']
-        }).execute()
+        }, returning='minimal').execute()
         
         return {
             "success": True,
@@ -431,12 +566,14 @@ async def select_positioning(business_id: str, selection: PositioningSelection):
 async def get_positioning(business_id: str):
     """Get positioning analysis"""
     try:
-        result = supabase.table('positioning_analyses')\
-            .select('*')\
-            .eq('business_id', business_id)\
-            .order('created_at', desc=True)\
-            .limit(1)\
+        result = await async_db_query(
+            lambda: supabase.table('positioning_analyses')
+            .select('*')
+            .eq('business_id', business_id)
+            .order('created_at', desc=True)
+            .limit(1)
             .execute()
+        )
         
         return result.data[0] if result.data else None
     
@@ -451,27 +588,16 @@ async def generate_icps(request: Request, business_id: str):
     try:
         user_id = getattr(request.state, 'user_id', 'anonymous')
 
-        # SECURITY: Verify ownership first (async)
-        biz = await async_db_query(
-            lambda: supabase.table('businesses').select('*').eq('id', business_id).single().execute()
-        )
-
-        if (hasattr(biz, 'error') and biz.error) or not biz.data:
-            raise HTTPException(status_code=404, detail="Business not found")
-
-        if biz.data.get('user_id') != user_id:
-            logger.warning(f"Access denied: User {user_id} attempted to access business {business_id}")
-            raise HTTPException(status_code=403, detail="Access denied")
+        # SECURITY: Verify ownership first (cached)
+        await get_owned_business(business_id, user_id)
 
-        # Check subscription tier (async)
-        sub = await async_db_query(
-            lambda: supabase.table('subscriptions').select('*').eq('business_id', business_id).single().execute()
-        )
+        # Check subscription tier (cached)
+        subscription = await get_cached_subscription(business_id)
 
-        if (hasattr(sub, 'error') and sub.error) or not sub.data:
+        if not subscription:
             raise HTTPException(status_code=500, detail="Subscription not found")
 
-        max_icps = sub.data['max_icps']
+        max_icps = subscription['max_icps']
         
         # Get positioning
         pos = supabase.table('positioning_analyses')\
@@ -507,7 +633,9 @@ async def generate_icps(request: Request, business_id: str):
 async def get_icps(business_id: str):
     """Get all ICPs for business"""
     try:
-        result = supabase.table('icps').select('*').eq('business_id', business_id).execute()
+        result = await async_db_query(
+            lambda: supabase.table('icps').select('*').eq('business_id', business_id).execute()
+        )
         return {"icps": result.data}
     
     except Exception as e:
@@ -521,29 +649,22 @@ async def create_move(request: Request, business_id: str, move: MoveCreate):
     try:
         user_id = getattr(request.state, 'user_id', 'anonymous')
 
-        # SECURITY: Verify ownership first (async)
-        biz = await async_db_query(
-            lambda: supabase.table('businesses').select('*').eq('id', business_id).single().execute()
-        )
-
-        if (hasattr(biz, 'error') and biz.error) or not biz.data:
-            raise HTTPException(status_code=404, detail="Business not found")
-
-        if biz.data.get('user_id') != user_id:
-            logger.warning(f"Access denied: User {user_id} attempted to access business {business_id}")
-            raise HTTPException(status_code=403, detail="Access denied")
-
-        # Get ICPs and positioning (async)
-        icps = await async_db_query(
-            lambda: supabase.table('icps').select('*').eq('business_id', business_id).execute()
-        )
-        pos = await async_db_query(
-            lambda: supabase.table('positioning_analyses')
-            .select('*')
-            .eq('business_id', business_id)
-            .order('created_at', desc=True)
-            .limit(1)
-            .execute()
+        # SECURITY: Verify ownership first (cached)
+        await get_owned_business(business_id, user_id)
+
+        # Get ICPs and positioning concurrently (independent queries)
+        icps, pos = await asyncio.gather(
+            async_db_query(
+                lambda: supabase.table('icps').select('*').eq('business_id', business_id).execute()
+            ),
+            async_db_query(
+                lambda: supabase.table('positioning_analyses')
+                .select('*')
+                .eq('business_id', business_id)
+                .order('created_at', desc=True)
+                .limit(1)
+                .execute()
+            ),
         )
         
         if not pos.data:
@@ -577,7 +698,9 @@ async def create_move(request: Request, business_id: str, move: MoveCreate):
 async def get_move(move_id: str):
     """Get campaign details"""
     try:
-        result = supabase.table('moves').select('*').eq('id', move_id).single().execute()
+        result = await async_db_query(
+            lambda: supabase.table('moves').select('*').eq('id', move_id).single().execute()
+        )
         return result.data
     
     except Exception as e:
@@ -587,7 +710,9 @@ async def get_move(move_id: str):
 async def get_business_moves(business_id: str):
     """Get all moves for a business"""
     try:
-        result = supabase.table('moves').select('*').eq('business_id', business_id).execute()
+        result = await async_db_query(
+            lambda: supabase.table('moves').select('*').eq('business_id', business_id).execute()
+        )
         return {"moves": result.data}
     
     except Exception as e:
@@ -600,7 +725,9 @@ async def measure_performance(performance: PerformanceSubmit):
     """Submit performance data for analysis"""
     try:
         # Get move and business data
-        move = supabase.table('moves').select('*').eq('id', performance.move_id).single().execute()
+        move = await async_db_query(
+            lambda: supabase.table('moves').select('*').eq('id', performance.move_id).single().execute()
+        )
         
         # Run analytics agent
         result = await analytics_agent.ainvoke({
@@ -678,20 +805,14 @@ async def razorpay_webhook(request: Request):
         
         # Read and verify payload
         payload = await request.body()
-        payload_str = payload.decode('utf-8')
         
         # Verify signature
-        try:
-            import razorpay
-            client = razorpay.Client(auth=(os.getenv('RAZORPAY_KEY_ID'), os.getenv('RAZORPAY_KEY_SECRET')))
-            client.utility.verify_webhook_signature(payload_str, signature, webhook_secret)
-        except Exception as e:
-            logger.error(f"Webhook signature verification failed: {e}")
+        if not verify_webhook_signature(payload, signature, webhook_secret):
+            logger.error("Webhook signature verification failed")
             raise HTTPException(status_code=401, detail="Invalid signature")
         
         # Process webhook
-        import json
-        event_data = json.loads(payload_str)
+        event_data = json.loads(payload)
         event = event_data.get('event')
         
         logger.info(f"Processing webhook event: {event}")
@@ -722,6 +843,8 @@ async def razorpay_webhook(request: Request):
                 logger.error(f"Failed to update subscription for business {notes['business_id']}")
                 raise HTTPException(status_code=404, detail="Business not found")
             
+            await invalidate_cached_subscription(notes['business_id'])
+            
             logger.info(f"Subscription updated for business {notes['business_id']} to tier {notes['tier']}")
         
         return {"status": "success"}
@@ -836,7 +959,7 @@ async def api_positioning_analyze(req: PositioningRequest):
                 sb.table("positioning_analyses").insert({
                     "business_id": req.business_id,
                     "options": result.get("options")
-                }).execute()
+                }, returning="minimal").execute()
         except Exception as e:
             logger.warning(f"Failed to persist positioning analysis: {e}")
         return result
@@ -904,19 +1027,23 @@ async def api_icps_generate(req: ICPRequest):
         # Best-effort persist
         try:
             if icps and isinstance(icps, list):
-                for icp in icps:
-                    if isinstance(icp, dict):
-                        sb.table("icps").insert({
-                            "business_id": req.business_id,
-                            "name": icp.get("name"),
-                            "demographics": icp.get("demographics"),
-                            "psychographics": icp.get("psychographics"),
-                            "platforms": icp.get("platforms"),
-                            "content_preferences": icp.get("contentPreferences"),
-                            "trending_topics": icp.get("trendingTopics"),
-                            "tags": icp.get("tags"),
-                            "embedding": icp.get("embedding"),
-                        }).execute()
+                # Bulk insert instead of a round trip per ICP
+                rows = [
+                    {
+                        "business_id": req.business_id,
+                        "name": icp.get("name"),
+                        "demographics": icp.get("demographics"),
+                        "psychographics": icp.get("psychographics"),
+                        "platforms": icp.get("platforms"),
+                        "content_preferences": icp.get("contentPreferences"),
+                        "trending_topics": icp.get("trendingTopics"),
+                        "tags": icp.get("tags"),
+                        "embedding": icp.get("embedding"),
+                    }
+                    for icp in icps
+                    if isinstance(icp, dict)
+                ]
+                insert_rows(sb, "icps", rows, returning="minimal")
         except Exception as e:
             logger.warning(f"Failed to persist ICPs: {e}")
         return {"icps": icps}
@@ -972,14 +1099,27 @@ async def api_moves_generate(req: MoveRequest):
 
 # ---------- HEALTH CHECK ----------
 
+# Probe results are reused briefly so container and load-balancer checks
+# don't each hit Supabase, Chroma and Redis
+HEALTH_CACHE_TTL = float(os.getenv('HEALTH_CACHE_TTL', '5'))
+_health_cache = (0.0, None)
+
+
 @app.get("/health")
 async def health_check():
     """Enhanced health check with system status"""
+    global _health_cache
+    now = time.monotonic()
+    if _health_cache[0] > now:
+        return _health_cache[1]
+
     try:
         # Check database connection
         db_status = "healthy"
         try:
-            supabase.table('businesses').select('id').limit(1).execute()
+            await run_in_threadpool(
+                supabase.table('businesses').select('id').limit(1).execute
+            )
         except Exception as e:
             db_status = f"unhealthy: {str(e)}"
         
@@ -987,7 +1127,6 @@ async def health_check():
         ai_status = "healthy (using cloud providers)"
         try:
             # Verify we can initialize the service manager (which configures LLMs)
-            from .core.service_factories import get_service_manager
             service_manager = get_service_manager()
             # Just verify the manager can be initialized without errors
             _ = service_manager.llm
@@ -998,7 +1137,6 @@ async def health_check():
         # Check Chroma DB
         chroma_status = "healthy"
         try:
-            from .utils.embeddings import get_chroma_client
             client = get_chroma_client()
             client.heartbeat()
         except Exception as e:
@@ -1007,13 +1145,11 @@ async def health_check():
         # Check Redis if available
         redis_status = "healthy"
         try:
-            import redis
-            r = redis.Redis(host=os.getenv('REDIS_HOST', 'localhost'), port=6379)
-            r.ping()
+            await get_async_redis_client().ping()
         except Exception:
             redis_status = "not configured"
         
-        return {
+        health = {
             "status": "healthy",
             "timestamp": datetime.utcnow().isoformat(),
             "version": "1.0.0",
@@ -1025,6 +1161,8 @@ async def health_check():
                 "redis": redis_status
             }
         }
+        _health_cache = (now + HEALTH_CACHE_TTL, health)
+        return health
     
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -1034,19 +1172,23 @@ async def health_check():
             "error": str(e)
         }
 
+# Rejections are the hot path during abuse bursts and the body never varies
+_SECURITY_FAILED_BODY = json.dumps({"detail": "Security validation failed"}).encode()
+
 # Global exception handler for security events
 @app.exception_handler(SecurityException)
 async def security_exception_handler(request: Request, exc: SecurityException):
-    logger.warning(f"Security exception at {request.url.path}: {exc}")
-    return JSONResponse(
+    logger.warning(f"Security exception at {request.scope['path']}: {exc}")
+    return Response(
         status_code=400,
-        content={"detail": "Security validation failed"}
+        content=_SECURITY_FAILED_BODY,
+        media_type="application/json"
     )
 
 @app.exception_handler(CostLimitExceeded)
 async def cost_limit_exception_handler(request: Request, exc: CostLimitExceeded):
-    logger.warning(f"Cost limit exceeded at {request.url.path}: {exc}")
-    return JSONResponse(
+    logger.warning(f"Cost limit exceeded at {request.scope['path']}: {exc}")
+    return DefaultJSONResponse(
         status_code=429,
         content={"detail": str(exc)}
     )
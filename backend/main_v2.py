@@ -9,6 +9,7 @@ Integrates:
 - GCP Secrets Manager
 """
 
+import json
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -16,12 +17,22 @@ from typing import Optional
 
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional native JSON encoder
+    orjson = None
+
+# ORJSONResponse only fails at render time without orjson, so pick it up front
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
 
 # Import core components
 from core.ai_provider_manager import get_ai_provider_manager
 from middleware.cost_controller_v2 import CostController
 from utils.gcp_secrets import get_secret_manager, SecretKeys
+from utils.supabase_client import get_supabase_client
 from utils.vertex_ai_vector_db import get_vertex_ai_db
 from agents.orchestration_v2 import RaptorFlowOrchestrator
 
@@ -91,7 +102,6 @@ async def lifespan(app: FastAPI):
         logger.info("✅ AI Provider Manager initialized with GPT-5 series + Gemini fallbacks")
 
         # Initialize cost controller (needs Supabase client)
-        from utils.supabase_client import get_supabase_client
         supabase = get_supabase_client()
         cost_controller = CostController(ai_provider_manager, supabase)
         logger.info("✅ Cost Controller initialized with tier-based budgets")
@@ -125,6 +135,11 @@ async def lifespan(app: FastAPI):
     # ========== SHUTDOWN ==========
     logger.info("🛑 RaptorFlow v1 Shutting down...")
 
+    # Write conversation counts still buffered in this worker
+    # Same module path the conversation routes import the manager from
+    from backend.utils.conversation_manager import flush_pending_conversation_counts
+    await flush_pending_conversation_counts()
+
     # Log final statistics
     if ai_provider_manager:
         stats = ai_provider_manager.get_usage_statistics()
@@ -147,6 +162,7 @@ app = FastAPI(
     version="2.0.0",
     description="AI-Powered Marketing Intelligence Platform with 3-Tier AI Routing",
     lifespan=lifespan,
+    default_response_class=DefaultJSONResponse,
 )
 
 # Add security middleware (order matters!)
@@ -160,25 +176,32 @@ if os.getenv('ENVIRONMENT') in ['production', 'staging', 'development']:
 # CORS Configuration
 environment = os.getenv('ENVIRONMENT', 'development')
 if environment == 'production':
-    allowed_origins = [
+    allowed_origins = frozenset([
         os.getenv('FRONTEND_URL', 'https://app.raptorflow.in'),
         "https://raptorflow.in"
-    ]
+    ])
 else:
-    allowed_origins = [
+    allowed_origins = frozenset([
         os.getenv('FRONTEND_URL', 'http://localhost:3000'),
         "http://localhost:5173",
         "http://127.0.0.1:3000",
         "http://127.0.0.1:5173"
-    ]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["Authorization", "Content-Type", "X-Requested-With"],
-)
+    ])
+
+# Same-origin deployments can set CORS_ENABLED=false to drop the middleware
+# (and its per-request origin check) from the stack entirely
+if os.getenv('CORS_ENABLED', 'true').lower() == 'true':
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=allowed_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["Authorization", "Content-Type", "X-Requested-With"],
+    )
+
+# Compress only payloads worth it (research/analysis JSON); level 1 costs a
+# fraction of the CPU of Starlette's default level 9 at a close ratio on JSON
+app.add_middleware(GZipMiddleware, minimum_size=4096, compresslevel=1)
 
 # ============================================================================
 # Include API Routes
@@ -195,15 +218,19 @@ app.include_router(ocr_router, prefix="/api/ocr", tags=["ocr"])
 # Core Routes
 # ============================================================================
 
+# Constant for the process lifetime, so serialised once at import
+_ROOT_BODY = json.dumps({
+    "service": "RaptorFlow ADAPT API v2",
+    "status": "running",
+    "version": "2.0.0",
+    "ai_model": "GPT-5 series with Gemini fallbacks",
+}).encode()
+
+
 @app.get("/")
 async def root():
     """API status endpoint"""
-    return {
-        "service": "RaptorFlow ADAPT API v2",
-        "status": "running",
-        "version": "2.0.0",
-        "ai_model": "GPT-5 series with Gemini fallbacks",
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
@@ -254,7 +281,6 @@ async def health_check():
 
     # Check Database
     try:
-        from utils.supabase_client import get_supabase_client
         supabase = get_supabase_client()
         supabase.table('businesses').select('count').limit(1).execute()
         services_status["database"] = "✅ Supabase connected"
@@ -307,7 +333,6 @@ async def analyze_business(
         user_id = getattr(request.state, 'user_id', 'anonymous')
 
         # Get business data
-        from utils.supabase_client import get_supabase_client
         supabase = get_supabase_client()
 
         business = supabase.table("businesses") \
@@ -467,13 +492,18 @@ async def list_ai_models():
 # Error Handlers
 # ============================================================================
 
+# Constant body, serialised once rather than on every failing request
+_INTERNAL_ERROR_BODY = json.dumps({"detail": "Internal server error"}).encode()
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for all uncaught exceptions"""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return Response(
         status_code=500,
-        content={"detail": "Internal server error"}
+        content=_INTERNAL_ERROR_BODY,
+        media_type="application/json"
     )
 
 
@@ -8,8 +8,8 @@ import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
-import redis
-import os
+
+from ..utils.redis_client import get_redis_client
 
 @dataclass
 class APICost:
@@ -34,11 +34,7 @@ class BudgetController:
     """HARD ENFORCER of budget limits"""
     
     def __init__(self):
-        self.redis_client = redis.Redis(
-            host=os.getenv('REDIS_HOST', 'localhost'),
-            port=int(os.getenv('REDIS_PORT', 6379)),
-            decode_responses=True
-        )
+        self.redis_client = get_redis_client()
         self.limits = DailyLimits()
         self.costs = APICost()
         
@@ -47,7 +43,21 @@ class BudgetController:
         today = datetime.now().strftime('%Y-%m-%d')
         usage_key = f"budget_usage:{today}"
         
-        usage = self.redis_client.hgetall(usage_key)
+        return self._parse_usage(self.redis_client.hgetall(usage_key))
+    
+    def get_preflight_state(self) -> Tuple[bool, Dict]:
+        """Emergency flag and today's usage, fetched in one pipelined round trip"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        usage_key = f"budget_usage:{today}"
+        
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.exists('budget_emergency_shutdown')
+        pipe.hgetall(usage_key)
+        emergency, usage = pipe.execute()
+        return bool(emergency), self._parse_usage(usage)
+    
+    @staticmethod
+    def _parse_usage(usage: Dict) -> Dict:
         if not usage:
             return {
                 'gpt5_nano_requests': 0,
@@ -76,9 +86,10 @@ class BudgetController:
         
         return input_cost + output_cost
     
-    def can_make_request(self, model: str, estimated_input_tokens: int = 400, estimated_output_tokens: int = 100) -> Tuple[bool, str]:
-        """Check if request can be made within budget"""
-        usage = self.get_daily_usage()
+    def can_make_request(self, model: str, estimated_input_tokens: int = 400, estimated_output_tokens: int = 100, usage: Optional[Dict] = None) -> Tuple[bool, str]:
+        """Check if request can be made within budget (pass usage to reuse an earlier read)"""
+        if usage is None:
+            usage = self.get_daily_usage()
         estimated_cost = self.calculate_request_cost(model, estimated_input_tokens, estimated_output_tokens)
         
         # Check daily budget
@@ -103,15 +114,17 @@ class BudgetController:
     def get_cheapest_viable_model(self, task_complexity: str, estimated_tokens: int = 500) -> str:
         """Always choose cheapest model that can handle the task"""
         # Priority order: GPT-5 Nano (cheapest) -> GPT-5 (expensive)
+        # Both checks read the same counters, so fetch them once
+        usage = self.get_daily_usage()
         
         # First try GPT-5 Nano
-        can_use_nano, reason = self.can_make_request("gpt-5-nano", estimated_tokens, estimated_tokens // 4)
+        can_use_nano, reason = self.can_make_request("gpt-5-nano", estimated_tokens, estimated_tokens // 4, usage)
         if can_use_nano:
             return "gpt-5-nano"
         
         # Only use GPT-5 if absolutely necessary and budget allows
         if task_complexity in ["complex_reasoning", "strategic_analysis"]:
-            can_use_gpt5, reason = self.can_make_request("gpt-5", estimated_tokens, estimated_tokens // 3)
+            can_use_gpt5, reason = self.can_make_request("gpt-5", estimated_tokens, estimated_tokens // 3, usage)
             if can_use_gpt5:
                 return "gpt-5"
         
@@ -126,20 +139,23 @@ class BudgetController:
         cost = self.calculate_request_cost(model, input_tokens, output_tokens)
         total_tokens = input_tokens + output_tokens
         
-        # Update counters
-        if model == "gpt-5-nano":
-            self.redis_client.hincrby(usage_key, 'gpt5_nano_requests', 1)
-        elif model == "gpt-5":
-            self.redis_client.hincrby(usage_key, 'gpt5_requests', 1)
-        
-        self.redis_client.hincrby(usage_key, 'total_tokens', total_tokens)
-        self.redis_client.hincrbyfloat(usage_key, 'total_cost', cost)
-        
         # Set expiry for tomorrow
         tomorrow = datetime.now() + timedelta(days=1)
         tomorrow_midnight = tomorrow.replace(hour=0, minute=0, second=0, microsecond=0)
         expiry_seconds = int((tomorrow_midnight - datetime.now()).total_seconds())
-        self.redis_client.expire(usage_key, expiry_seconds)
+        
+        # Update counters and expiry in one round trip; the EXPIRE rides along
+        # with every update, so the key can never be left without a TTL
+        pipe = self.redis_client.pipeline(transaction=False)
+        if model == "gpt-5-nano":
+            pipe.hincrby(usage_key, 'gpt5_nano_requests', 1)
+        elif model == "gpt-5":
+            pipe.hincrby(usage_key, 'gpt5_requests', 1)
+        
+        pipe.hincrby(usage_key, 'total_tokens', total_tokens)
+        pipe.hincrbyfloat(usage_key, 'total_cost', cost)
+        pipe.expire(usage_key, expiry_seconds)
+        pipe.execute()
     
     def get_budget_status(self) -> Dict:
         """Get current budget status with warnings"""
@@ -200,8 +216,9 @@ def check_budget_before_api_call(model: str, estimated_input_tokens: int = 400,
     """Decorator to check budget before API calls"""
     def decorator(func):
         def wrapper(*args, **kwargs):
-            # Check emergency mode
-            if budget_controller.is_emergency_mode():
+            # Check emergency mode (same round trip as the usage read below)
+            emergency, usage = budget_controller.get_preflight_state()
+            if emergency:
                 return {
                     'error': 'BUDGET_EXHAUSTED',
                     'message': 'Daily budget exhausted. Please try again tomorrow.',
@@ -209,7 +226,7 @@ def check_budget_before_api_call(model: str, estimated_input_tokens: int = 400,
                 }
             
             # Check if request is allowed
-            can_make, reason = budget_controller.can_make_request(model, estimated_input_tokens, estimated_output_tokens)
+            can_make, reason = budget_controller.can_make_request(model, estimated_input_tokens, estimated_output_tokens, usage)
             if not can_make:
                 return {
                     'error': 'BUDGET_LIMIT_EXCEEDED',
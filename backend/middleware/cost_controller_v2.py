@@ -314,18 +314,13 @@ class CostController:
         subscription = await self._get_subscription(business_id)
         tier_config = self.TIER_LIMITS[subscription["tier"]]
 
-        # Get current usage
-        icps = self.db.table("icps") \
-            .select("count") \
-            .eq("business_id", business_id) \
-            .execute()
-        current_icps = icps.count
-
-        moves = self.db.table("moves") \
-            .select("count") \
-            .eq("business_id", business_id) \
-            .execute()
-        current_moves = moves.count
+        # Get current usage; both counts come back from one RPC round trip
+        usage = self.db.rpc(
+            "get_feature_usage", {"p_business_id": business_id}
+        ).execute()
+        counts = usage.data[0] if usage.data else {}
+        current_icps = counts.get("icp_count") or 0
+        current_moves = counts.get("move_count") or 0
 
         return {
             "tier": subscription["tier"],
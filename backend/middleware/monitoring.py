@@ -51,27 +51,28 @@ class MonitoringMiddleware:
     async def track_request(request: Request, call_next):
         """Track all requests"""
         
-        start_time = time.time()
+        start_time = time.perf_counter()
+        path = request.scope["path"]
         
         try:
             response = await call_next(request)
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             # Record metrics
             REQUEST_COUNT.labels(
                 method=request.method,
-                endpoint=request.url.path,
+                endpoint=path,
                 status=response.status_code
             ).inc()
             
             REQUEST_DURATION.labels(
                 method=request.method,
-                endpoint=request.url.path
+                endpoint=path
             ).observe(duration)
             
             # Log request
             logger.info(
-                f"{request.method} {request.url.path} - "
+                f"{request.method} {path} - "
                 f"Status: {response.status_code} - "
                 f"Duration: {duration:.3f}s"
             )
@@ -79,17 +80,17 @@ class MonitoringMiddleware:
             return response
         
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             # Record error
             ERROR_COUNT.labels(
                 error_type=type(e).__name__,
-                endpoint=request.url.path
+                endpoint=path
             ).inc()
             
             # Log error
             logger.error(
-                f"{request.method} {request.url.path} - "
+                f"{request.method} {path} - "
                 f"Error: {str(e)} - "
                 f"Duration: {duration:.3f}s",
                 exc_info=True
@@ -132,7 +133,7 @@ async def check_supabase():
         supabase = get_supabase_client()
         supabase.table('businesses').select('id').limit(1).execute()
         return True
-    except:
+    except Exception:
         return False
 
 async def check_gemini():
@@ -140,5 +141,5 @@ async def check_gemini():
         gemini = get_gemini_client()
         gemini.generate_content("test")
         return True
-    except:
+    except Exception:
         return False
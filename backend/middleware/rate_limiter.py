@@ -2,21 +2,46 @@ from fastapi import HTTPException, Request
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-import redis
 from datetime import datetime, timedelta
 
+from ..utils.redis_client import get_async_redis_client
+
 # Initialize limiter
 limiter = Limiter(key_func=get_remote_address)
 
-# Redis for distributed rate limiting
-redis_client = redis.Redis(
-    host=os.getenv('REDIS_HOST', 'localhost'),
-    port=6379,
-    decode_responses=True
-)
+# Check and claim a quota slot atomically: the counter only moves while under
+# the limit, so a rejected call needs no compensating DECR and concurrent
+# calls can't overshoot. Returns {allowed, count before this call}.
+_CLAIM_SLOT_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if current >= tonumber(ARGV[1]) then
+    return {0, current}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return {1, current - 1}
+"""
+_claim_slot_script = None
+
+
+def _get_claim_slot_script():
+    """Register the script once; redis-py runs it by EVALSHA and reloads on NOSCRIPT"""
+    global _claim_slot_script
+    if _claim_slot_script is None:
+        _claim_slot_script = get_async_redis_client().register_script(_CLAIM_SLOT_LUA)
+    return _claim_slot_script
+
 
 class TieredRateLimiter:
-    """Rate limiting based on subscription tier"""
+    """
+    Rate limiting based on subscription tier
+
+    Counters live at ratelimit:{business_id}:<resource>:<day>. The braces are
+    a Redis Cluster hashtag, so every counter for one business hashes to the
+    same slot and can be read or updated together in one script or pipeline.
+    """
     
     LIMITS = {
         'basic': {
@@ -51,14 +76,16 @@ class TieredRateLimiter:
         """Check if user has exceeded their tier limit"""
         
         limits = TieredRateLimiter.LIMITS.get(tier, TieredRateLimiter.LIMITS['basic'])
-        limit_key = f"{business_id}:{resource}:{datetime.now().strftime('%Y-%m-%d')}"
-        
-        current = redis_client.get(limit_key)
-        current_count = int(current) if current else 0
+        limit_key = f"ratelimit:{{{business_id}}}:{resource}:{datetime.now().strftime('%Y-%m-%d')}"
         
         max_limit = limits.get(resource, 0)
         
-        if current_count >= max_limit:
+        # Async client so the counter round trip doesn't block the event loop
+        allowed, current_count = await _get_claim_slot_script()(
+            keys=[limit_key], args=[max_limit, 86400]
+        )
+        
+        if not allowed:
             raise HTTPException(
                 status_code=429,
                 detail={
@@ -71,5 +98,4 @@ class TieredRateLimiter:
                 }
             )
         
-        # Increment counter
-        redis_client.incr(limit_key)
+        return True
@@ -8,22 +8,65 @@ import time
 import re
 import json
 import hashlib
-import hmac
-from typing import Dict, List, Optional, Callable
+from typing import Callable, Dict, Optional, Tuple
 from fastapi import Request, Response, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
-import bleach
 import logging
-from datetime import datetime, timedelta
-import redis
-from slowapi import Limiter, _rate_limit_exceeded_handler
+from datetime import datetime
+from slowapi import Limiter
 from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+
+try:
+    from ..utils.redis_client import get_async_redis_client, get_redis_client
+except ImportError:  # loaded as a top-level package (main_v2, tests)
+    from utils.redis_client import get_async_redis_client, get_redis_client
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional native JSON parser
+    orjson = None
+
+try:
+    import jwt
+except ImportError:  # pragma: no cover - basic token validation fallback
+    jwt = None
 
 logger = logging.getLogger(__name__)
 
+
+def _loads_json(body: bytes):
+    """Parse a JSON request body, using orjson's native parser when installed."""
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(body)
+    return json.loads(body.decode('utf-8'))
+
+
+# Path sets are built once at import and shared by the middlewares below, so
+# the per-request skip checks are a single frozenset lookup on scope["path"].
+# Health and metrics probes hit every few seconds from containers and load
+# balancers; auditing them only adds two log records per probe.
+_PROBE_PATHS = frozenset({'/health', '/metrics'})
+_VALIDATION_SKIP_PATHS = _PROBE_PATHS | {'/'}
+_AUDIT_SKIP_PATHS = _PROBE_PATHS
+_PUBLIC_PATHS = _PROBE_PATHS | {
+    '/',
+    '/docs',
+    '/openapi.json',
+    '/api/intake',  # Allow business creation
+    '/api/razorpay/webhook',  # Webhooks
+}
+
+# Compiled once at import instead of being rebuilt on every validate_input call
+_SQL_INJECTION_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"('|(\\')|(;)|(\\;))(\s)*(union|select|insert|update|delete|drop|create|alter|exec|execute)",
+    r"(\s)*(or|and)(\s)+(\w)+(\s)*(=|like|>|<)",
+    r"(--)(.*)",
+    r"(/\*)(.*?)(\*/)",
+))
+
 class SecurityException(Exception):
     """Custom security exception"""
     pass
@@ -52,6 +95,11 @@ class AISafetyMiddleware:
             r'onerror=',
         ]
         
+        self._malicious_regexes = [
+            re.compile(pattern, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+            for pattern in self.malicious_patterns
+        ]
+        
         self.max_input_length = 50000
         self.max_requests_per_minute = {
             'intake': 5,
@@ -72,21 +120,14 @@ class AISafetyMiddleware:
             raise SecurityException(f"{field_name} exceeds maximum length")
         
         # Check for malicious patterns
-        for pattern in self.malicious_patterns:
-            if re.search(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL):
-                logger.warning(f"Malicious pattern detected in {field_name}: {pattern}")
+        for regex in self._malicious_regexes:
+            if regex.search(text):
+                logger.warning(f"Malicious pattern detected in {field_name}: {regex.pattern}")
                 raise SecurityException(f"Potentially malicious content detected in {field_name}")
         
         # Check for SQL injection patterns
-        sql_patterns = [
-            r"('|(\\')|(;)|(\\;))(\s)*(union|select|insert|update|delete|drop|create|alter|exec|execute)",
-            r"(\s)*(or|and)(\s)+(\w)+(\s)*(=|like|>|<)",
-            r"(--)(.*)",
-            r"(/\*)(.*?)(\*/)",
-        ]
-        
-        for pattern in sql_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for regex in _SQL_INJECTION_PATTERNS:
+            if regex.search(text):
                 logger.warning(f"SQL injection pattern detected in {field_name}")
                 raise SecurityException(f"Invalid content detected in {field_name}")
         
@@ -135,16 +176,29 @@ class CostControlMiddleware:
         
         # Redis for cost tracking (fallback to in-memory if not available)
         try:
-            self.redis_client = redis.Redis(
-                host=os.getenv('REDIS_HOST', 'localhost'),
-                port=int(os.getenv('REDIS_PORT', 6379)),
-                decode_responses=True
-            )
-            self.redis_client.ping()
+            # Probe once on the shared sync pool; the async methods below then
+            # await the asyncio client so a Redis round trip never blocks the loop
+            get_redis_client().ping()
+            self.redis_client = get_async_redis_client()
         except Exception:
             logger.warning("Redis not available, using in-memory cost tracking")
             self.redis_client = None
             self.memory_store = {}
+            # Keys are day-scoped: drop the store when the day rolls over and
+            # cap its size, mirroring the 24h expiry used in Redis
+            self.memory_store_day = None
+            self.memory_store_max = int(os.getenv('COST_MEMORY_STORE_MAX', '10000'))
+            # Highest spend evicted today; untracked users are charged at
+            # least this much so eviction never hands anyone fresh budget
+            self.memory_store_floor = 0.0
+    
+    def _memory_store_for(self, today: str) -> dict:
+        """Return the in-memory store, discarding entries from earlier days"""
+        if self.memory_store_day != today:
+            self.memory_store.clear()
+            self.memory_store_day = today
+            self.memory_store_floor = 0.0
+        return self.memory_store
     
     async def get_user_tier(self, user_id: str) -> str:
         """Get user's subscription tier"""
@@ -159,14 +213,14 @@ class CostControlMiddleware:
         
         if self.redis_client:
             try:
-                spend = self.redis_client.get(key)
+                spend = await self.redis_client.get(key)
                 return float(spend) if spend else 0.0
             except Exception:
                 pass
         
         # Fallback to memory store
         if hasattr(self, 'memory_store'):
-            return self.memory_store.get(key, 0.0)
+            return self._memory_store_for(today).get(key, self.memory_store_floor)
         
         return 0.0
     
@@ -175,19 +229,31 @@ class CostControlMiddleware:
         today = datetime.now().strftime('%Y-%m-%d')
         key = f"cost:{user_id}:{today}"
         
+        # The day is part of the key, so each counter is a fixed window;
+        # INCRBYFLOAT returns the new total and saves re-reading it below
+        current_spend = None
         if self.redis_client:
             try:
-                self.redis_client.incrbyfloat(key, actual_cost)
-                self.redis_client.expire(key, 86400)  # 24 hours
+                current_spend = await self.redis_client.incrbyfloat(key, actual_cost)
+                await self.redis_client.expire(key, 86400)  # 24 hours
             except Exception:
                 pass
         
         # Fallback to memory store
         if hasattr(self, 'memory_store'):
-            self.memory_store[key] = self.memory_store.get(key, 0.0) + actual_cost
+            store = self._memory_store_for(today)
+            if key not in store and len(store) >= self.memory_store_max:
+                # Evict the oldest-inserted user for today, folding their
+                # spend into the floor every untracked user starts from
+                evicted = store.pop(next(iter(store)))
+                self.memory_store_floor = max(self.memory_store_floor, evicted)
+            store[key] = store.get(key, self.memory_store_floor) + actual_cost
         
         # Alert if approaching limit
-        current_spend = await self.get_daily_spend(user_id)
+        if current_spend is None:
+            current_spend = await self.get_daily_spend(user_id)
+        else:
+            current_spend = float(current_spend)
         user_tier = await self.get_user_tier(user_id)
         limit = self.daily_limits[user_tier]
         
@@ -232,38 +298,59 @@ class RateLimitMiddleware:
                 return limit
         return self.limits['default']
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# Response headers are constant for the process lifetime, so they are encoded
+# once as raw ASGI (name, value) pairs instead of set per response
+_SECURITY_HEADERS = (
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+    (b"content-security-policy", (
+        b"default-src 'self'; "
+        b"script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+        b"style-src 'self' 'unsafe-inline'; "
+        b"img-src 'self' data: https:; "
+        b"font-src 'self'; "
+        b"connect-src 'self'; "
+        b"frame-ancestors 'none'; "
+        b"base-uri 'self'; "
+        b"form-action 'self'"
+    )),
+)
+_HSTS_HEADER = (b"strict-transport-security", b"max-age=31536000; includeSubDomains; preload")
+
+
+class SecurityHeadersMiddleware:
     """Add security headers to all responses"""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        
+    def __init__(self, app):
+        self.app = app
+        # ENVIRONMENT is fixed for the process lifetime; read it once
+        self.enable_hsts = os.getenv('ENVIRONMENT') == 'production'
         # HSTS for HTTPS
-        if os.getenv('ENVIRONMENT') == 'production':
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
-        
-        # Content Security Policy
-        csp = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self'; "
-            "connect-src 'self'; "
-            "frame-ancestors 'none'; "
-            "base-uri 'self'; "
-            "form-action 'self'"
-        )
-        response.headers["Content-Security-Policy"] = csp
-        
-        return response
+        self.headers = list(_SECURITY_HEADERS)
+        if self.enable_hsts:
+            self.headers.append(_HSTS_HEADER)
+        # Our values replace any the route already set, as assigning
+        # response.headers[name] did, rather than sending duplicates
+        self.header_names = frozenset(name for name, _ in self.headers)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    (name, value)
+                    for name, value in message.get("headers", ())
+                    if name.lower() not in self.header_names
+                ] + self.headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 class InputValidationMiddleware(BaseHTTPMiddleware):
     """Validate and sanitize all incoming requests"""
@@ -273,8 +360,12 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
         self.ai_safety = AISafetyMiddleware()
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        # scope["path"] is the raw path; request.url would build and parse a
+        # full URL object for every request
+        path = request.scope["path"]
+
         # Skip validation for health checks and metrics
-        if request.url.path in ['/health', '/metrics', '/']:
+        if path in _VALIDATION_SKIP_PATHS:
             return await call_next(request)
         
         # Validate JSON payload
@@ -282,8 +373,8 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
             try:
                 body = await request.body()
                 if body:
-                    data = json.loads(body.decode('utf-8'))
-                    await self.validate_payload(data, request.url.path)
+                    data = _loads_json(body)
+                    await self.validate_payload(data, path)
             except json.JSONDecodeError:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -302,54 +393,94 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
         """Validate payload based on endpoint"""
         if not isinstance(data, dict):
             return
-            
-        # Common fields validation
-        for field_name, value in data.items():
-            try:
-                if isinstance(value, str):
-                    await self.ai_safety.validate_input(value, field_name)
-                elif isinstance(value, dict):
-                    await self.validate_payload(value, path)
-                elif isinstance(value, list):
-                    for item in value:
-                        if isinstance(item, (str, dict)):
+
+        # Walk nested objects with an explicit stack instead of recursing
+        # per dict, so deep payloads cost no extra coroutine frames
+        pending = [data]
+        while pending:
+            node = pending.pop()
+            for field_name, value in node.items():
+                try:
+                    if isinstance(value, str):
+                        await self.ai_safety.validate_input(value, field_name)
+                    elif isinstance(value, dict):
+                        pending.append(value)
+                    elif isinstance(value, list):
+                        for item in value:
                             if isinstance(item, str):
                                 await self.ai_safety.validate_input(item, field_name)
-                            else:
-                                await self.validate_payload(item, path)
-            except SecurityException:
-                # Re-raise security exceptions
-                raise
-            except Exception as e:
-                logger.error(f"Error validating field {field_name}: {e}")
-                # Continue validation for other fields
-
-class AuthenticationMiddleware(BaseHTTPMiddleware):
-    """JWT-based authentication middleware"""
+                            elif isinstance(item, dict):
+                                pending.append(item)
+                except SecurityException:
+                    # Re-raise security exceptions
+                    raise
+                except Exception as e:
+                    logger.error(f"Error validating field {field_name}: {e}")
+                    # Continue validation for other fields
+
+class AuthenticationMiddleware:
+    """
+    JWT-based authentication middleware
+
+    Pure ASGI: it only reads headers, so the BaseHTTPMiddleware task and
+    stream pair would be pure overhead on every authenticated request.
+    """
     
     def __init__(self, app):
-        super().__init__(app)
+        self.app = app
         self.jwt_secret = os.getenv('JWT_SECRET')
         if not self.jwt_secret:
             raise ValueError("JWT_SECRET environment variable is required")
         
-        self.public_paths = [
-            '/',
-            '/health',
-            '/metrics',
-            '/docs',
-            '/openapi.json',
-            '/api/intake',  # Allow business creation
-            '/api/razorpay/webhook',  # Webhooks
-        ]
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        self.public_paths = _PUBLIC_PATHS
+
+        # Verified payloads keyed by a digest of the raw token, so repeat
+        # requests with the same bearer token skip HS256 verification
+        self.token_cache_ttl = int(os.getenv('JWT_CACHE_TTL', '60'))
+        self.token_cache_max = int(os.getenv('JWT_CACHE_MAX', '10000'))
+        self.invalid_token_ttl = 5
+        # Reject already-expired tokens from their unverified claims before
+        # running HMAC; only ever used to reject, never to authenticate
+        self.precheck_exp = os.getenv('JWT_PRECHECK_EXP', 'true').lower() == 'true'
+        self._token_cache: Dict[bytes, Tuple[float, Optional[dict]]] = {}
+
+    def _cache_token(self, key: bytes, payload: Optional[dict], ttl: float) -> None:
+        """Store a verification result (None marks an invalid token)"""
+        if len(self._token_cache) >= self.token_cache_max:
+            now = time.time()
+            self._token_cache = {
+                k: v for k, v in self._token_cache.items() if v[0] > now
+            }
+            if len(self._token_cache) >= self.token_cache_max:
+                self._token_cache.clear()
+        self._token_cache[key] = (time.time() + ttl, payload)
+
+    async def __call__(self, scope, receive, send):
         # Skip authentication for public paths
-        if request.url.path in self.public_paths:
-            return await call_next(request)
-        
+        if scope["type"] != "http" or scope["path"] in self.public_paths:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            self._authenticate(scope)
+        except HTTPException as exc:
+            response = JSONResponse(
+                {"detail": exc.detail},
+                status_code=exc.status_code,
+                headers=exc.headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    def _authenticate(self, scope) -> None:
+        """Verify the bearer token and put the user on request.state"""
+        # Backs request.state for the handlers further down the stack
+        state = scope.setdefault("state", {})
+
         # Extract and validate JWT token
-        authorization = request.headers.get('Authorization')
+        authorization = Headers(scope=scope).get('Authorization')
         if not authorization or not authorization.startswith('Bearer '):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -358,32 +489,50 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
             )
         
         token = authorization.split(' ')[1]
+        if jwt is None:
+            # Fallback if PyJWT is not installed
+            logger.warning("PyJWT not installed, using basic token validation")
+            if not token or len(token) < 10:
+                raise ValueError("Invalid token")
+            state["user_id"] = "temp_user_id"
+            return
+
         try:
-            import jwt
-            import time
+            # exp is an integer epoch claim, so compare against integer seconds
+            now = int(time.time())
+            cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+            cached = self._token_cache.get(cache_key)
+            if cached is not None and cached[0] > now:
+                payload = cached[1]
+                if payload is None:
+                    raise ValueError("Token previously rejected")
+            else:
+                if self.precheck_exp:
+                    claims = jwt.decode(token, options={"verify_signature": False})
+                    if claims.get('exp', 0) < now:
+                        raise ValueError("Token expired")
+                
+                # Decode JWT token
+                try:
+                    payload = jwt.decode(
+                        token, 
+                        self.jwt_secret, 
+                        algorithms=["HS256"],
+                        options={"verify_exp": True}
+                    )
+                except jwt.PyJWTError:
+                    self._cache_token(cache_key, None, self.invalid_token_ttl)
+                    raise
+                self._cache_token(cache_key, payload, self.token_cache_ttl)
             
-            # Decode JWT token
-            payload = jwt.decode(
-                token, 
-                self.jwt_secret, 
-                algorithms=["HS256"],
-                options={"verify_exp": True}
-            )
-            
-            # Check if token is expired
-            if payload.get('exp', 0) < time.time():
+            # Check if token is expired (cached payloads only need this check)
+            if payload.get('exp', 0) < now:
                 raise ValueError("Token expired")
             
             # Add user info to request state
-            request.state.user_id = payload.get('user_id', 'unknown')
-            request.state.user_tier = payload.get('tier', 'basic')
+            state["user_id"] = payload.get('user_id', 'unknown')
+            state["user_tier"] = payload.get('tier', 'basic')
             
-        except ImportError:
-            # Fallback if PyJWT is not installed
-            logger.warning("PyJWT not installed, using basic token validation")
-            if not token or len(token) < 10:
-                raise ValueError("Invalid token")
-            request.state.user_id = "temp_user_id"
         except Exception as e:
             logger.warning(f"Authentication failed: {e}")
             raise HTTPException(
@@ -391,14 +540,18 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                 detail="Invalid authentication token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        
-        return await call_next(request)
 
-class AuditLoggingMiddleware(BaseHTTPMiddleware):
-    """Comprehensive audit logging"""
+class AuditLoggingMiddleware:
+    """
+    Comprehensive audit logging
+
+    Written as a pure ASGI middleware: it only needs the response status, so
+    wrapping ``send`` avoids the task and memory-stream pair that
+    BaseHTTPMiddleware adds to every request.
+    """
     
     def __init__(self, app):
-        super().__init__(app)
+        self.app = app
         self.logger = logging.getLogger('audit')
         
         # Configure audit logger
@@ -409,36 +562,59 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         handler.setFormatter(formatter)
         self.logger.addHandler(handler)
         self.logger.setLevel(logging.INFO)
+
+        # Level is fixed above; resolve it once so requests compare ints
+        self.log_level = self.logger.getEffectiveLevel()
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
-        
+    async def __call__(self, scope, receive, send):
+        # Audit logger filtered out, or a liveness probe: skip formatting and
+        # header lookups entirely
+        if (scope["type"] != "http" or self.log_level > logging.WARNING
+                or scope["path"] in _AUDIT_SKIP_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        log_info = self.log_level <= logging.INFO
+        path = scope["path"]
+        client = scope.get("client")
+        client_ip = client[0] if client else 'unknown'
+
         # Log request
-        self.logger.info(
-            f"Request: {request.method} {request.url.path} - "
-            f"IP: {request.client.host if request.client else 'unknown'} - "
-            f"User-Agent: {request.headers.get('user-agent', 'unknown')}"
-        )
-        
-        response = await call_next(request)
-        
+        if log_info:
+            user_agent = 'unknown'
+            for name, value in scope["headers"]:
+                if name == b'user-agent':
+                    user_agent = value.decode('latin-1')
+                    break
+            self.logger.info(
+                "Request: %s %s - IP: %s - User-Agent: %s",
+                scope["method"], path, client_ip, user_agent
+            )
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_with_status)
+
         # Log response
-        duration = time.time() - start_time
-        self.logger.info(
-            f"Response: {response.status_code} - "
-            f"Duration: {duration:.3f}s - "
-            f"Path: {request.url.path}"
-        )
-        
+        if log_info:
+            self.logger.info(
+                "Response: %s - Duration: %.3fs - Path: %s",
+                status_code, time.perf_counter() - start_time, path
+            )
+
         # Log security events
-        if response.status_code >= 400:
+        if status_code >= 400:
             self.logger.warning(
-                f"Security Event: {response.status_code} - "
-                f"Path: {request.url.path} - "
-                f"IP: {request.client.host if request.client else 'unknown'}"
+                "Security Event: %s - Path: %s - IP: %s",
+                status_code, path, client_ip
             )
-        
-        return response
 
 # Initialize middleware instances
 ai_safety = AISafetyMiddleware()
@@ -11,7 +11,6 @@ from typing import Dict, List, Optional, Any
 from urllib.parse import urlparse
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
 from ..state import ResearchState
@@ -41,11 +40,19 @@ class FetcherAgent:
 
         logger.info(f"Fetching content from {len(unique_urls)} URLs")
 
-        # Parallel fetch with semaphore
+        # Parallel fetch with semaphore, over one pooled session so hosts that
+        # appear more than once reuse their connection (and DNS lookup)
+        import aiohttp
+
         semaphore = asyncio.Semaphore(self.max_concurrent)
-        fetch_tasks = [self._fetch_url_safe(url, semaphore) for url in unique_urls]
+        connector = aiohttp.TCPConnector(limit=self.max_concurrent, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        ) as session:
+            fetch_tasks = [self._fetch_url_safe(session, url, semaphore) for url in unique_urls]
 
-        results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
+            results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
 
         fetched_content = []
         extraction_errors = []
@@ -66,27 +73,24 @@ class FetcherAgent:
         logger.info(f"Fetched {len(fetched_content)} URLs successfully")
         return state
 
-    async def _fetch_url_safe(self, url: str, semaphore: asyncio.Semaphore) -> Optional[Dict]:
+    async def _fetch_url_safe(self, session, url: str, semaphore: asyncio.Semaphore) -> Optional[Dict]:
         """Fetch URL with rate limiting"""
         async with semaphore:
-            return await self._fetch_url(url)
+            return await self._fetch_url(session, url)
 
-    async def _fetch_url(self, url: str) -> Optional[Dict]:
+    async def _fetch_url(self, session, url: str) -> Optional[Dict]:
         """Simulate URL fetching (in production would use playwright/httpx)"""
         try:
-            import aiohttp
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
-                    if response.status == 200:
-                        text = await response.text()
-                        return {
-                            "url": url,
-                            "title": response.headers.get("title", ""),
-                            "text": text[:50000],
-                            "word_count": len(text.split()),
-                            "fetch_timestamp": asyncio.get_event_loop().time()
-                        }
+            async with session.get(url) as response:
+                if response.status == 200:
+                    text = await response.text()
+                    return {
+                        "url": url,
+                        "title": response.headers.get("title", ""),
+                        "text": text[:50000],
+                        "word_count": len(text.split()),
+                        "fetch_timestamp": asyncio.get_event_loop().time()
+                    }
         except Exception as e:
             logger.debug(f"Failed to fetch {url}: {e}")
         return None
@@ -0,0 +1,54 @@
+"""
+Runs migration 009's create_user_with_org against a real Postgres.
+
+Needs TEST_DATABASE_URL pointing at a database with the schema and
+migrations applied; everything runs in a transaction that is rolled back.
+"""
+
+import json
+import os
+import uuid
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL, reason="TEST_DATABASE_URL not set"
+)
+
+
+@pytest.fixture
+def connection():
+    engine = sqlalchemy.create_engine(DATABASE_URL)
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        yield conn
+        transaction.rollback()
+    engine.dispose()
+
+
+def _signup(conn, email, slug):
+    row = conn.execute(
+        sqlalchemy.text(
+            "SELECT create_user_with_org("
+            ":sub, :email, 'John', NULL, 'John''s Organization', :slug)"
+        ),
+        {"sub": f"google-{uuid.uuid4()}", "email": email, "slug": slug},
+    ).scalar_one()
+    return row if isinstance(row, dict) else json.loads(row)
+
+
+def test_colliding_slug_gets_suffix_instead_of_failing(connection):
+    """john@gmail.com and john@acme.com both sign up."""
+    base = f"john-{uuid.uuid4().hex[:8]}"
+
+    first = _signup(connection, f"{base}@gmail.com", base)
+    second = _signup(connection, f"{base}@acme.com", base)
+
+    assert first["org"]["slug"] == base
+    assert second["org"]["slug"].startswith(f"{base}-")
+    assert second["org"]["slug"] != base
+    assert second["user"]["email"] == f"{base}@acme.com"
@@ -0,0 +1,199 @@
+
+from __future__ import annotations
+
+import asyncio
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from utils.conversation_manager import (
+    ConversationManager,
+    decode_conversation_cursor,
+    encode_conversation_cursor,
+)
+
+_TERM = re.compile(r'^(\w+)\.(eq|lt)\."(.*)"$')
+_OPS = {"eq": lambda a, b: a == b, "lt": lambda a, b: a < b}
+
+
+def _split_top_level(expr):
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(expr):
+        depth += ch == "("
+        depth -= ch == ")"
+        if ch == "," and depth == 0:
+            parts.append(expr[start:i])
+            start = i + 1
+    parts.append(expr[start:])
+    return parts
+
+
+def _matches(row, term):
+    if term.startswith("and(") and term.endswith(")"):
+        return all(_matches(row, t) for t in _split_top_level(term[4:-1]))
+    field, op, value = _TERM.match(term).groups()
+    return _OPS[op](row[field], value)
+
+
+class FakeQuery:
+    """The slice of the PostgREST builder that list_conversations uses."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.orders = []
+        self.window = None
+
+    def select(self, *_):
+        return self
+
+    def eq(self, field, value):
+        self.rows = [r for r in self.rows if r[field] == value]
+        return self
+
+    def ilike(self, field, pattern):
+        self.ilike_pattern = pattern
+        return self
+
+    def or_(self, expr):
+        terms = _split_top_level(expr)
+        self.rows = [r for r in self.rows if any(_matches(r, t) for t in terms)]
+        return self
+
+    def order(self, field, desc=False):
+        self.orders.append((field, desc))
+        return self
+
+    def limit(self, count):
+        self.window = (0, count)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end - start + 1)
+        return self
+
+    def execute(self):
+        rows = self.rows
+        for field, desc in reversed(self.orders):
+            rows = sorted(rows, key=lambda r: r[field], reverse=desc)
+        if self.window:
+            start, count = self.window
+            rows = rows[start:start + count]
+        return SimpleNamespace(data=rows)
+
+
+def _uuid(n):
+    return f"00000000-0000-0000-0000-{n:012d}"
+
+
+def _conversation(conv_id, created_at):
+    return {
+        "id": conv_id,
+        "org_id": "org",
+        "user_id": "user",
+        "title": f"Conversation {conv_id}",
+        "status": "active",
+        "message_count": 0,
+        "token_count": 0,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+@pytest.fixture
+def manager():
+    manager = ConversationManager.__new__(ConversationManager)
+    manager.rows = []
+    manager.queries = []
+
+    def table(_name):
+        manager.queries.append(FakeQuery(manager.rows))
+        return manager.queries[-1]
+
+    manager.supabase = SimpleNamespace(table=table)
+    return manager
+
+
+class TestConversationCursor:
+    def test_round_trip_is_url_safe(self):
+        token = encode_conversation_cursor("2024-01-01T00:00:00+00:00", _uuid(7))
+
+        assert re.fullmatch(r"[A-Za-z0-9_-]+", token)
+        assert decode_conversation_cursor(token) == ("2024-01-01T00:00:00+00:00", _uuid(7))
+
+    @pytest.mark.parametrize("token", ["not base64!", "bm8tc2VwYXJhdG9y"])
+    def test_rejects_foreign_tokens(self, token):
+        with pytest.raises(ValueError):
+            decode_conversation_cursor(token)
+
+    @pytest.mark.parametrize("created_at, conversation_id", [
+        ('2024-01-01T00:00:00+00:00"),id.gt.(0', _uuid(1)),
+        ("2024-01-01T00:00:00+00:00", '1",status.eq."deleted'),
+    ])
+    def test_rejects_forged_filter_values(self, created_at, conversation_id):
+        """Quotes, commas and parens never reach the or_() filter string."""
+        with pytest.raises(ValueError):
+            decode_conversation_cursor(encode_conversation_cursor(created_at, conversation_id))
+
+
+class TestListConversations:
+    def test_keyset_pages_through_tied_timestamps(self, manager):
+        """Rows sharing created_at across a page boundary are neither skipped nor repeated."""
+        tied = "2024-01-01T00:00:00+00:00"
+        manager.rows = [_conversation(_uuid(i), tied) for i in range(5)]
+        manager.rows.append(_conversation(_uuid(9), "2023-12-31T00:00:00+00:00"))
+
+        seen, before = [], None
+        while True:
+            page = asyncio.run(manager.list_conversations("org", "user", limit=2, before=before))
+            seen.extend(c.id for c in page)
+            if len(page) < 2:
+                break
+            before = decode_conversation_cursor(
+                encode_conversation_cursor(page[-1].created_at, page[-1].id)
+            )
+
+        assert seen == [_uuid(i) for i in (4, 3, 2, 1, 0, 9)]
+
+
+class TestSearchConversations:
+    @pytest.mark.parametrize("query, pattern", [
+        ("ab", "%ab%"),
+        ("50%_off", "%50\\%\\_off%"),
+        # PostgREST turns '*' into '%', so it goes out as the '_' wildcard
+        ("a*b", "%a_b%"),
+        ("a\\b", "%a\\\\b%"),
+    ])
+    def test_substring_pattern_with_wildcards_neutralised(self, manager, query, pattern):
+        asyncio.run(manager.search_conversations("org", query))
+
+        assert manager.queries[-1].ilike_pattern == pattern
+
+
+class TestConversationCountFlush:
+    def test_failed_write_is_requeued_and_retried(self, manager):
+        """A failed flush keeps its deltas, merged with ones queued meanwhile."""
+        manager.count_flush_interval = 0
+        manager._pending_counts = {}
+        manager._flush_task = None
+        calls = []
+
+        async def update(conversation_id, token_count, message_count):
+            calls.append((conversation_id, message_count, token_count))
+            return len(calls) > 1
+
+        manager._update_conversation_counts = update
+
+        async def scenario():
+            manager._queue_conversation_counts("c1", token_count=10)
+            await manager._flush_task
+            assert manager._pending_counts == {"c1": [1, 10]}
+
+            # The failed flush scheduled its own retry
+            manager._queue_conversation_counts("c1", token_count=5)
+            await manager._flush_task
+
+        asyncio.run(scenario())
+
+        assert calls == [("c1", 1, 10), ("c1", 2, 15)]
+        assert manager._pending_counts == {}
@@ -0,0 +1,43 @@
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from utils.embedding_service import EmbeddingService
+from utils.supabase_client import InMemorySupabaseClient
+
+
+def _service_with_rows(rows):
+    service = EmbeddingService.__new__(EmbeddingService)
+    service.supabase = InMemorySupabaseClient()
+    service.supabase.table("message_embeddings").insert(rows).execute()
+    return service
+
+
+class TestComputeEmbeddingStats:
+    def test_pairwise_similarity_over_text_and_list_vectors(self):
+        """pgvector text and plain lists both score; zero vectors count as 0.0."""
+        service = _service_with_rows([
+            {"conversation_id": "c1", "embedding": "[1,0]"},
+            {"conversation_id": "c1", "embedding": [1.0, 0.0]},
+            {"conversation_id": "c1", "embedding": [0.0, 0.0]},
+            {"conversation_id": "c2", "embedding": [0.0, 1.0]},
+        ])
+
+        stats = asyncio.run(service.compute_embedding_stats("c1"))
+
+        assert "error" not in stats
+        assert stats["total_embeddings"] == 3
+        assert stats["max_similarity"] == pytest.approx(1.0)
+        assert stats["min_similarity"] == pytest.approx(0.0)
+        assert stats["avg_similarity"] == pytest.approx(1 / 3)
+
+    def test_needs_two_embeddings(self):
+        service = _service_with_rows([{"conversation_id": "c1", "embedding": [1.0]}])
+
+        stats = asyncio.run(service.compute_embedding_stats("c1"))
+
+        assert stats["total_embeddings"] == 1
+        assert stats["avg_similarity"] == 0
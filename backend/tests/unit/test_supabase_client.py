@@ -0,0 +1,25 @@
+
+from __future__ import annotations
+
+from utils.supabase_client import InMemorySupabaseClient, insert_rows
+
+
+class TestInsertRows:
+    def test_groups_by_columns_and_chunks(self):
+        """Rows with different key sets go in separate bulk inserts."""
+        client = InMemorySupabaseClient()
+        rows = [{"a": i} for i in range(5)] + [{"a": 9, "b": 1}]
+
+        inserted = insert_rows(client, "items", rows, batch_size=2)
+
+        assert len(inserted) == 6
+        assert all("id" in row for row in inserted)
+        assert len(client.table("items").select("*").execute().data) == 6
+
+    def test_minimal_returning_and_empty_input(self):
+        """returning='minimal' stores rows without echoing them back."""
+        client = InMemorySupabaseClient()
+
+        assert insert_rows(client, "items", [{"a": 1}], returning="minimal") == []
+        assert insert_rows(client, "items", []) == []
+        assert len(client.table("items").select("*").execute().data) == 1
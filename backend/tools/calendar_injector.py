@@ -33,7 +33,7 @@ class CalendarInjectorTool(BaseTool):
         
         # Get existing calendar
         move = self.supabase.table('moves')\
-            .select('*')\
+            .select('calendar, platform')\
             .eq('id', move_id)\
             .single()\
             .execute()
@@ -102,21 +102,13 @@ Return JSON:
             }
         }
         
-        # Insert into calendar
-        if insertion_day < len(calendar['calendar']):
-            calendar['calendar'][insertion_day]['posts'].append(new_post)
-        else:
-            # Add new day if needed
-            calendar['calendar'].append({
-                'day': len(calendar['calendar']) + 1,
-                'posts': [new_post]
-            })
-        
-        # Update move in database
-        self.supabase.table('moves')\
-            .update({'calendar': calendar})\
-            .eq('id', move_id)\
-            .execute()
+        # Append the post in the database; the JSONB merge runs server-side
+        # so concurrent edits made during generation are not overwritten
+        self.supabase.rpc('append_calendar_post', {
+            'p_move_id': move_id,
+            'p_day_index': insertion_day,
+            'p_post': new_post
+        }).execute()
         
         return json.dumps({
             'success': True,
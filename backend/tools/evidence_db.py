@@ -122,29 +122,26 @@ class EvidenceDBTool(BaseTool):
             if not node_id:
                 raise ValueError("get_subgraph requires: node_id")
             
-            # Get the node
+            # Get the node with its outgoing and incoming edges embedded,
+            # so the whole subgraph comes back in one request
             node = self.supabase.table('evidence_nodes')\
-                .select('*')\
+                .select(
+                    '*, '
+                    'outgoing:evidence_edges!from_node(*, to_node:evidence_nodes!to_node(*)), '
+                    'incoming:evidence_edges!to_node(*, from_node:evidence_nodes!from_node(*))'
+                )\
                 .eq('id', node_id)\
                 .single()\
                 .execute()
             
-            # Get all outgoing edges
-            outgoing = self.supabase.table('evidence_edges')\
-                .select('*, to_node:evidence_nodes!to_node(*)')\
-                .eq('from_node', node_id)\
-                .execute()
-            
-            # Get all incoming edges
-            incoming = self.supabase.table('evidence_edges')\
-                .select('*, from_node:evidence_nodes!from_node(*)')\
-                .eq('to_node', node_id)\
-                .execute()
+            node_data = node.data or {}
+            outgoing = node_data.pop('outgoing', None) or []
+            incoming = node_data.pop('incoming', None) or []
             
             return json.dumps({
                 'node': node.data,
-                'outgoing': outgoing.data,
-                'incoming': incoming.data
+                'outgoing': outgoing,
+                'incoming': incoming
             })
         
         elif action == 'get_claims':
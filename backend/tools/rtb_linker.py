@@ -6,7 +6,7 @@ from typing import Any, Iterable, List
 
 from langchain.tools import BaseTool
 
-from utils.supabase_client import get_supabase_client
+from utils.supabase_client import get_supabase_client, insert_rows
 
 
 class RTBLinkerTool(BaseTool):
@@ -51,31 +51,36 @@ class RTBLinkerTool(BaseTool):
             .data[0]
         )
 
-        evidence_rows: List[dict[str, Any]] = []
-        for snippet in evidence:
-            ev_record = (
-                self.supabase.table("evidence_nodes")
-                .insert(
-                    {
-                        "business_id": business_id,
-                        "node_type": "rtb",
-                        "content": snippet,
-                        "source": source,
-                        "confidence_score": 1.0,
-                    }
-                )
-                .execute()
-                .data[0]
-            )
+        # Insert evidence nodes and edges in bulk rather than two round
+        # trips per snippet
+        evidence_rows: List[dict[str, Any]] = insert_rows(
+            self.supabase,
+            "evidence_nodes",
+            [
+                {
+                    "business_id": business_id,
+                    "node_type": "rtb",
+                    "content": snippet,
+                    "source": source,
+                    "confidence_score": 1.0,
+                }
+                for snippet in evidence
+            ],
+        )
 
-            self.supabase.table("evidence_edges").insert(
+        insert_rows(
+            self.supabase,
+            "evidence_edges",
+            [
                 {
                     "from_node": claim_record["id"],
                     "to_node": ev_record["id"],
                     "relationship_type": "supported_by",
                 }
-            ).execute()
-            evidence_rows.append(ev_record)
+                for ev_record in evidence_rows
+            ],
+            returning="minimal",
+        )
 
         if evidence_rows:
             avg_confidence = sum(row.get("confidence_score", 0.0) for row in evidence_rows) / len(evidence_rows)
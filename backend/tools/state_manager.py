@@ -39,14 +39,15 @@ class StateManagerTool(BaseTool):
             if not agent or not business_id or not state:
                 raise ValueError("save requires: agent, business_id, state")
             
+            now = datetime.utcnow().isoformat()
             result = self.supabase.table('agent_sessions').insert({
                 'business_id': business_id,
                 'agent_name': agent,
                 'state': state,
                 'context': context or {},
                 'status': status,
-                'created_at': datetime.utcnow().isoformat(),
-                'updated_at': datetime.utcnow().isoformat()
+                'created_at': now,
+                'updated_at': now
             }).execute()
             
             return json.dumps({
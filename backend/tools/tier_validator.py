@@ -6,9 +6,19 @@ from typing import Any
 
 from langchain.tools import BaseTool
 
-from utils.subscription_tiers import SUBSCRIPTION_TIERS
+from utils.subscription_tiers import FEATURE_BITS, SUBSCRIPTION_TIERS, TIER_FEATURE_MASKS
 from utils.supabase_client import get_supabase_client
 
+# Entry tier, used when a business has no (or an unknown) subscription tier
+_DEFAULT_TIER = min(SUBSCRIPTION_TIERS, key=lambda name: SUBSCRIPTION_TIERS[name]["price_inr"])
+
+# Cheapest tier unlocking each feature, resolved once instead of per check
+_UPGRADE_TIER: dict[str, str] = {}
+for _name in sorted(SUBSCRIPTION_TIERS, key=lambda name: SUBSCRIPTION_TIERS[name]["price_inr"]):
+    for _feature, _bit in FEATURE_BITS.items():
+        if TIER_FEATURE_MASKS[_name] & _bit:
+            _UPGRADE_TIER.setdefault(_feature, _name)
+
 
 class TierValidatorTool(BaseTool):
     """Validate whether a business' subscription tier grants access to a feature."""
@@ -32,18 +42,15 @@ class TierValidatorTool(BaseTool):
             .execute()
         )
 
-        tier = response.data["tier"] if response.data else "basic"
-        tier_info = SUBSCRIPTION_TIERS.get(tier, SUBSCRIPTION_TIERS["basic"])
+        tier = response.data["tier"] if response.data else _DEFAULT_TIER
+        if tier not in SUBSCRIPTION_TIERS:
+            tier = _DEFAULT_TIER
+        tier_info = SUBSCRIPTION_TIERS[tier]
 
-        features = tier_info.get("features", set())
-        has_access = feature in features or feature == "basic"
-
-        upgrade_to: str | None = None
-        if not has_access:
-            for name, info in SUBSCRIPTION_TIERS.items():
-                if feature in info.get("features", set()):
-                    upgrade_to = name
-                    break
+        has_access = feature == "basic" or bool(
+            TIER_FEATURE_MASKS[tier] & FEATURE_BITS.get(feature, 0)
+        )
+        upgrade_to: str | None = None if has_access else _UPGRADE_TIER.get(feature)
 
         payload: dict[str, Any] = {
             "business_id": business_id,
@@ -66,6 +66,18 @@ class CloudProviderService:
     OPENROUTER_API_KEY: OpenRouter API key (fallback for both modes)
     """
 
+    # Prod-mode model routing tables, built once with the class
+    PROD_MODEL_BY_COMPLEXITY = {
+        "simple": ModelConfig.GPT5_NANO,
+        "moderate": ModelConfig.GPT5_MINI,
+        "complex": ModelConfig.GPT5_STANDARD,
+    }
+    OPENROUTER_MODEL_BY_MODEL = {
+        ModelConfig.GPT5_NANO: ModelConfig.OPENROUTER_GPT5_NANO,
+        ModelConfig.GPT5_MINI: ModelConfig.OPENROUTER_GPT5_MINI,
+        ModelConfig.GPT5_STANDARD: ModelConfig.OPENROUTER_GPT5,
+    }
+
     def __init__(self):
         self.app_mode: AppMode = os.getenv("APP_MODE", "dev").lower()
         self.model_config = ModelConfig()
@@ -129,13 +141,7 @@ class CloudProviderService:
             return self.model_config.GEMINI_FLASH
 
         # Production mode - use GPT-5 series
-        complexity_map = {
-            "simple": self.model_config.GPT5_NANO,
-            "moderate": self.model_config.GPT5_MINI,
-            "complex": self.model_config.GPT5_STANDARD
-        }
-
-        return complexity_map.get(task_complexity, self.model_config.GPT5_MINI)
+        return self.PROD_MODEL_BY_COMPLEXITY.get(task_complexity, self.model_config.GPT5_MINI)
 
     def generate(
         self,
@@ -287,13 +293,7 @@ class CloudProviderService:
                 logger.info(f"Falling back to OpenRouter with {model} (prod mode)")
 
                 # Map GPT-5 model to OpenRouter equivalent
-                openrouter_model_map = {
-                    self.model_config.GPT5_NANO: self.model_config.OPENROUTER_GPT5_NANO,
-                    self.model_config.GPT5_MINI: self.model_config.OPENROUTER_GPT5_MINI,
-                    self.model_config.GPT5_STANDARD: self.model_config.OPENROUTER_GPT5,
-                }
-
-                openrouter_model = openrouter_model_map.get(model, self.model_config.OPENROUTER_GPT5_MINI)
+                openrouter_model = self.OPENROUTER_MODEL_BY_MODEL.get(model, self.model_config.OPENROUTER_GPT5_MINI)
 
                 return self._call_openrouter(
                     prompt,
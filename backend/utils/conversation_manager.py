@@ -15,8 +15,13 @@ Integrates with:
 - Organization scoping
 """
 
+import asyncio
+import base64
+import binascii
 import logging
-from typing import Optional, List, Dict, Any
+import os
+import uuid
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 from dataclasses import dataclass, asdict
 import json
@@ -26,6 +31,35 @@ from backend.utils.supabase_client import get_supabase_client
 logger = logging.getLogger(__name__)
 
 
+def encode_conversation_cursor(created_at: str, conversation_id: str) -> str:
+    """Opaque, URL-safe page token for the (created_at, id) keyset"""
+    raw = f"{created_at}|{conversation_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_conversation_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Inverse of encode_conversation_cursor
+
+    Both parts are client-supplied and end up in a PostgREST filter string,
+    so they are parsed and re-serialised rather than passed through.
+
+    Raises:
+        ValueError: If the token was not produced by encode_conversation_cursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, sep, conversation_id = raw.partition("|")
+        if not sep:
+            raise ValueError("missing separator")
+        return (
+            datetime.fromisoformat(created_at).isoformat(),
+            str(uuid.UUID(conversation_id)),
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
 @dataclass
 class Message:
     """Single message in a conversation"""
@@ -63,6 +97,15 @@ class ConversationManager:
     def __init__(self):
         self.supabase = get_supabase_client()
 
+        # Per-conversation [messages, tokens] deltas waiting to be written;
+        # flushed together so each message no longer costs two round trips.
+        # The stored counts are eventually consistent: they trail by up to
+        # one flush interval, and deltas still buffered when the process
+        # dies are lost (failed writes are re-queued, not dropped)
+        self.count_flush_interval = float(os.getenv("CONVERSATION_COUNT_FLUSH_SECONDS", "5"))
+        self._pending_counts: Dict[str, List[int]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
     async def create_conversation(
         self,
         org_id: str,
@@ -177,6 +220,36 @@ class ConversationManager:
             logger.error(f"Failed to get conversation: {e}")
             return None
 
+    async def conversation_exists(
+        self,
+        conversation_id: str,
+        user_id: str,
+        org_id: str,
+    ) -> bool:
+        """
+        Access check without loading the conversation row
+
+        Args:
+            conversation_id: Conversation ID
+            user_id: User ID (for access control)
+            org_id: Organization ID (for access control)
+
+        Returns:
+            True if the conversation exists and belongs to the user
+        """
+        try:
+            response = self.supabase.table("conversations").select(
+                "id"
+            ).eq("id", conversation_id).eq(
+                "org_id", org_id
+            ).eq("user_id", user_id).limit(1).execute()
+
+            return bool(response.data)
+
+        except Exception as e:
+            logger.error(f"Failed to check conversation: {e}")
+            return False
+
     async def list_conversations(
         self,
         org_id: str,
@@ -184,6 +257,7 @@ class ConversationManager:
         limit: int = 20,
         offset: int = 0,
         status: str = "active",
+        before: Optional[Tuple[str, str]] = None,
     ) -> List[Conversation]:
         """
         List conversations for user/org
@@ -192,20 +266,40 @@ class ConversationManager:
             org_id: Organization ID
             user_id: User ID
             limit: Max results
-            offset: Pagination offset
+            offset: Pagination offset (ignored when before is given)
             status: Filter by status (active, archived, deleted)
+            before: Keyset cursor as (created_at, id) of the last row seen
+                (see decode_conversation_cursor); only rows after it in
+                (created_at DESC, id DESC) order are returned
 
         Returns:
             List of Conversation objects
         """
         try:
-            response = self.supabase.table("conversations").select(
+            query = self.supabase.table("conversations").select(
                 "*"
             ).eq("org_id", org_id).eq(
                 "user_id", user_id
-            ).eq("status", status).order(
-                "created_at", desc=True
-            ).range(offset, offset + limit - 1).execute()
+            ).eq("status", status)
+
+            # Seeking past the cursor stays cheap at any depth, whereas
+            # OFFSET makes Postgres read and discard every skipped row.
+            # id breaks created_at ties so rows sharing a timestamp at a
+            # page boundary are neither skipped nor repeated
+            if before:
+                created_at, last_id = before
+                query = query.or_(
+                    f'created_at.lt."{created_at}",'
+                    f'and(created_at.eq."{created_at}",id.lt."{last_id}")'
+                ).order("created_at", desc=True).order(
+                    "id", desc=True
+                ).limit(limit)
+            else:
+                query = query.order("created_at", desc=True).order(
+                    "id", desc=True
+                ).range(offset, offset + limit - 1)
+
+            response = query.execute()
 
             conversations = []
             for conv in response.data:
@@ -268,12 +362,9 @@ class ConversationManager:
 
             msg = response.data[0]
 
-            # Update conversation message count and token count
+            # Queue conversation message count and token count update
             token_count = metadata.get("tokens", 0) if metadata else 0
-            await self._update_conversation_counts(
-                conversation_id,
-                token_count,
-            )
+            self._queue_conversation_counts(conversation_id, token_count)
 
             logger.info(
                 f"Added {role} message to conversation {conversation_id}"
@@ -463,6 +554,12 @@ class ConversationManager:
                     "user_id", user_id
                 ).execute()
 
+            # The mutation returns the rows it touched, so no separate
+            # existence check is needed
+            if not response.data:
+                logger.warning(f"Conversation not found: {conversation_id}")
+                return False
+
             logger.info(f"Deleted conversation: {conversation_id}")
             return True
 
@@ -488,12 +585,27 @@ class ConversationManager:
             List of matching Conversation objects
         """
         try:
-            # Note: Supabase full-text search requires specific setup
-            # This is a simple LIKE search
+            # Served by the idx_conversations_title_trgm trigram index
+            # (migration 003). LIKE wildcards are escaped so a bare '%'
+            # can't turn the search into a match-everything scan. '*'
+            # can't be escaped: PostgREST rewrites every '*' in an ilike
+            # value to '%' before Postgres sees it, so it is sent as the
+            # single-character wildcard '_' instead. A literal '*' still
+            # matches, and so does any other character in its place.
+            # Queries under three characters form no trigram and fall
+            # back to a scan, but keep the same substring semantics
+            escaped = (
+                query.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+                .replace("*", "_")
+            )
+            pattern = f"%{escaped}%"
+
             response = self.supabase.table("conversations").select(
                 "*"
             ).eq("org_id", org_id).ilike(
-                "title", f"%{query}%"
+                "title", pattern
             ).limit(limit).execute()
 
             conversations = []
@@ -519,39 +631,95 @@ class ConversationManager:
             logger.error(f"Failed to search conversations: {e}")
             return []
 
-    async def _update_conversation_counts(
+    def _queue_conversation_counts(
         self,
         conversation_id: str,
         token_count: int = 0,
     ) -> None:
         """
-        Update conversation message and token counts
+        Buffer a message/token count increment and schedule a flush
 
         Args:
             conversation_id: Conversation ID
             token_count: Tokens to add
         """
-        try:
-            # Get current counts
-            response = self.supabase.table("conversations").select(
-                "message_count, token_count"
-            ).eq("id", conversation_id).execute()
+        self._add_pending_counts(conversation_id, 1, token_count)
+        self._schedule_count_flush()
 
-            if not response.data:
-                return
+    def _add_pending_counts(
+        self,
+        conversation_id: str,
+        message_count: int,
+        token_count: int,
+    ) -> None:
+        """Add deltas to a conversation's buffered counts"""
+        pending = self._pending_counts.setdefault(conversation_id, [0, 0])
+        pending[0] += message_count
+        pending[1] += token_count
+
+    def _schedule_count_flush(self) -> None:
+        """Start a delayed flush unless one is already pending"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_counts_later())
+
+    async def _flush_counts_later(self) -> None:
+        """Wait one flush interval, then write all buffered counts"""
+        await asyncio.sleep(self.count_flush_interval)
+        # Clear first so a failed write inside the flush can schedule a retry
+        self._flush_task = None
+        await self.flush_conversation_counts()
+
+    async def flush_conversation_counts(self) -> None:
+        """
+        Write all buffered count increments, one update per conversation
+
+        Deltas whose write fails are put back in the buffer (merged with
+        any that arrived meanwhile) and retried on the next flush.
+        """
+        pending, self._pending_counts = self._pending_counts, {}
+        failed = False
+        for conversation_id, (message_count, token_count) in pending.items():
+            if not await self._update_conversation_counts(
+                conversation_id,
+                token_count,
+                message_count,
+            ):
+                self._add_pending_counts(conversation_id, message_count, token_count)
+                failed = True
+
+        if failed:
+            self._schedule_count_flush()
+
+    async def _update_conversation_counts(
+        self,
+        conversation_id: str,
+        token_count: int = 0,
+        message_count: int = 1,
+    ) -> bool:
+        """
+        Update conversation message and token counts
 
-            current = response.data[0]
-            new_message_count = current["message_count"] + 1
-            new_token_count = current["token_count"] + token_count
+        Args:
+            conversation_id: Conversation ID
+            token_count: Tokens to add
+            message_count: Messages to add
 
-            # Update counts
-            self.supabase.table("conversations").update({
-                "message_count": new_message_count,
-                "token_count": new_token_count,
-            }).eq("id", conversation_id).execute()
+        Returns:
+            True if the increment was written
+        """
+        try:
+            # Increment in place with one UPDATE ... RETURNING, instead of
+            # reading the current counts back first
+            self.supabase.rpc("increment_conversation_counts", {
+                "p_conversation_id": conversation_id,
+                "p_message_count": message_count,
+                "p_token_count": token_count,
+            }).execute()
+            return True
 
         except Exception as e:
             logger.error(f"Failed to update conversation counts: {e}")
+            return False
 
 
 # Singleton instance
@@ -564,3 +732,14 @@ def get_conversation_manager() -> ConversationManager:
     if _manager is None:
         _manager = ConversationManager()
     return _manager
+
+
+async def flush_pending_conversation_counts() -> None:
+    """
+    Write buffered conversation counts (call on shutdown)
+
+    Anything that still fails here is lost with the process, so stored
+    counts are eventually consistent rather than exact.
+    """
+    if _manager is not None:
+        await _manager.flush_conversation_counts()
@@ -15,22 +15,42 @@ Integrates with:
 - Supabase database
 """
 
+import asyncio
 import logging
 import os
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 import json
 
-import openai
-from sklearn.metrics.pairwise import cosine_similarity
+from openai import AsyncOpenAI
 import numpy as np
 
-from backend.utils.supabase_client import get_supabase_client
+from backend.utils.supabase_client import get_supabase_client, insert_rows
 from backend.utils.cloud_provider import get_cloud_provider
 
 logger = logging.getLogger(__name__)
 
 
+def _as_vector(values) -> np.ndarray:
+    """
+    Embedding as a float32 array (half the memory of Python floats/float64).
+
+    pgvector columns come back from PostgREST as '[x,y,...]' text, which is
+    parsed directly without building an intermediate list.
+    """
+    if isinstance(values, str):
+        return np.fromstring(values.strip("[]"), dtype=np.float32, sep=",")
+    return np.asarray(values, dtype=np.float32)
+
+
+def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity of two 1-D vectors (0.0 when either is all zeros)"""
+    denom = np.linalg.norm(a) * np.linalg.norm(b)
+    if denom == 0:
+        return 0.0
+    return float(np.dot(a, b) / denom)
+
+
 @dataclass
 class EmbeddingResult:
     """Result of embedding generation"""
@@ -62,9 +82,16 @@ class EmbeddingService:
         self.embedding_model = "text-embedding-3-small"  # Fast & efficient
         self.embedding_dimension = 1536
 
-        # Initialize OpenAI client
+        # Batch embedding: texts per request, rough token budget per request
+        # (chars/4, under the 8192-token input cap) and requests in flight
+        self.embed_batch_size = int(os.getenv("EMBED_BATCH_SIZE", "96"))
+        self.embed_batch_tokens = 7500
+        self.embed_concurrency = int(os.getenv("EMBED_CONCURRENCY", "4"))
+
+        # Initialize OpenAI client (async, so embedding calls don't block the event loop)
+        self.client: Optional[AsyncOpenAI] = None
         if self.openai_api_key:
-            openai.api_key = self.openai_api_key
+            self.client = AsyncOpenAI(api_key=self.openai_api_key)
         else:
             logger.warning("OPENAI_API_KEY not set for embeddings")
 
@@ -87,7 +114,7 @@ class EmbeddingService:
             ValueError: If embedding generation fails
         """
         try:
-            if not self.openai_api_key:
+            if self.client is None:
                 raise ValueError("OpenAI API key not configured")
 
             if not text or len(text.strip()) == 0:
@@ -98,13 +125,13 @@ class EmbeddingService:
             # Generate embedding
             logger.info(f"Generating embedding for text: {text[:50]}...")
 
-            response = openai.Embedding.create(
+            response = await self.client.embeddings.create(
                 input=text,
                 model=model,
             )
 
-            embedding = response["data"][0]["embedding"]
-            tokens = response["usage"]["prompt_tokens"]
+            embedding = response.data[0].embedding
+            tokens = response.usage.prompt_tokens
 
             logger.info(f"Generated embedding with {len(embedding)} dimensions")
 
@@ -119,6 +146,97 @@ class EmbeddingService:
             logger.error(f"Failed to generate embedding: {e}")
             raise ValueError(f"Failed to generate embedding: {e}")
 
+    def _chunk_for_embedding(self, texts: List[str]) -> List[List[int]]:
+        """Group text indices into request-sized batches (empty texts are skipped)"""
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            tokens = len(text) // 4 + 1
+            if current and (
+                len(current) >= self.embed_batch_size
+                or current_tokens + tokens > self.embed_batch_tokens
+            ):
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def generate_embeddings(
+        self,
+        texts: List[str],
+        model: Optional[str] = None,
+    ) -> List[Optional[EmbeddingResult]]:
+        """
+        Generate embeddings for many texts with chunked, concurrent requests
+
+        Args:
+            texts: Texts to embed
+            model: Optional model override (default: text-embedding-3-small)
+
+        Returns:
+            One EmbeddingResult per text, in input order (None where it failed)
+
+        Raises:
+            ValueError: If the OpenAI client is not configured
+        """
+        if self.client is None:
+            raise ValueError("OpenAI API key not configured")
+
+        model = model or self.embedding_model
+        results: List[Optional[EmbeddingResult]] = [None] * len(texts)
+        semaphore = asyncio.Semaphore(self.embed_concurrency)
+
+        async def embed_chunk(indices: List[int]) -> None:
+            async with semaphore:
+                try:
+                    response = await self.client.embeddings.create(
+                        input=[texts[i] for i in indices],
+                        model=model,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to generate embedding batch of {len(indices)}: {e}")
+                    return
+
+            tokens_each = response.usage.prompt_tokens // len(indices)
+            for item in response.data:
+                i = indices[item.index]
+                results[i] = EmbeddingResult(
+                    text=texts[i],
+                    embedding=item.embedding,
+                    model=model,
+                    tokens=tokens_each,
+                )
+
+        chunks = self._chunk_for_embedding(texts)
+        await asyncio.gather(*(embed_chunk(chunk) for chunk in chunks))
+
+        logger.info(f"Generated {sum(r is not None for r in results)}/{len(texts)} embeddings in {len(chunks)} requests")
+        return results
+
+    @staticmethod
+    def _embedding_row(
+        message_id: str,
+        conversation_id: str,
+        embedding: List[float],
+        model: str,
+    ) -> Dict[str, Any]:
+        """Row shape for the message_embeddings table"""
+        return {
+            "message_id": message_id,
+            "conversation_id": conversation_id,
+            "embedding": embedding,
+            "embedding_model": model,
+            "content_length": len(embedding),
+        }
+
     async def store_embedding(
         self,
         message_id: str,
@@ -143,13 +261,9 @@ class EmbeddingService:
         """
         try:
             # Store in message_embeddings table
-            response = self.supabase.table("message_embeddings").insert({
-                "message_id": message_id,
-                "conversation_id": conversation_id,
-                "embedding": embedding,
-                "embedding_model": model,
-                "content_length": len(embedding),
-            }).execute()
+            response = self.supabase.table("message_embeddings").insert(
+                self._embedding_row(message_id, conversation_id, embedding, model)
+            ).execute()
 
             if not response.data:
                 raise ValueError("Failed to store embedding")
@@ -225,47 +339,12 @@ class EmbeddingService:
             if not query_embedding:
                 return []
 
-            # Get all embeddings in conversation
-            response = self.supabase.table("message_embeddings").select(
-                "id, message_id, embedding, messages:conversation_messages(id, conversation_id, role, content, created_at)"
-            ).eq("conversation_id", conversation_id).execute()
-
-            if not response.data:
-                logger.info(f"No embeddings found for conversation: {conversation_id}")
-                return []
-
-            # Calculate similarities
-            results = []
-            query_vec = np.array(query_embedding.embedding).reshape(1, -1)
-
-            for item in response.data:
-                try:
-                    msg = item.get("messages", {})
-                    if not msg:
-                        continue
-
-                    embedding_vec = np.array(item["embedding"]).reshape(1, -1)
-                    similarity = cosine_similarity(query_vec, embedding_vec)[0][0]
-
-                    if similarity >= threshold:
-                        results.append(SearchResult(
-                            message_id=msg.get("id"),
-                            conversation_id=msg.get("conversation_id"),
-                            content=msg.get("content"),
-                            role=msg.get("role"),
-                            similarity_score=float(similarity),
-                            created_at=msg.get("created_at"),
-                        ))
-
-                except Exception as e:
-                    logger.warning(f"Error processing embedding: {e}")
-                    continue
-
-            # Sort by similarity score
-            results.sort(key=lambda x: x.similarity_score, reverse=True)
-
-            # Return top results
-            return results[:limit]
+            return self._match_embeddings(
+                query_embedding.embedding,
+                limit,
+                threshold,
+                conversation_id=conversation_id,
+            )
 
         except Exception as e:
             logger.error(f"Semantic search failed: {e}")
@@ -297,53 +376,53 @@ class EmbeddingService:
             if not query_embedding:
                 return []
 
-            # Get embeddings from all org conversations
-            # Note: This requires a more complex query with joins
-            # For simplicity, we'll do it in Python
-            response = self.supabase.table("message_embeddings").select(
-                "id, message_id, embedding, messages:conversation_messages(id, role, content, created_at, conversations:conversations(id, org_id))"
-            ).execute()
-
-            if not response.data:
-                return []
-
-            results = []
-            query_vec = np.array(query_embedding.embedding).reshape(1, -1)
-
-            for item in response.data:
-                try:
-                    msg = item.get("messages", {})
-                    conv = msg.get("conversations", {})
-
-                    # Check org scope
-                    if conv.get("org_id") != org_id:
-                        continue
-
-                    embedding_vec = np.array(item["embedding"]).reshape(1, -1)
-                    similarity = cosine_similarity(query_vec, embedding_vec)[0][0]
-
-                    if similarity >= threshold:
-                        results.append(SearchResult(
-                            message_id=msg.get("id"),
-                            conversation_id=conv.get("id"),
-                            content=msg.get("content"),
-                            role=msg.get("role"),
-                            similarity_score=float(similarity),
-                            created_at=msg.get("created_at"),
-                        ))
-
-                except Exception as e:
-                    logger.warning(f"Error in global search: {e}")
-                    continue
-
-            # Sort and return top results
-            results.sort(key=lambda x: x.similarity_score, reverse=True)
-            return results[:limit]
+            return self._match_embeddings(
+                query_embedding.embedding,
+                limit,
+                threshold,
+                org_id=org_id,
+            )
 
         except Exception as e:
             logger.error(f"Global semantic search failed: {e}")
             return []
 
+    def _match_embeddings(
+        self,
+        embedding: List[float],
+        limit: int,
+        threshold: float,
+        conversation_id: Optional[str] = None,
+        org_id: Optional[str] = None,
+    ) -> List[SearchResult]:
+        """
+        Nearest messages ranked in Postgres (migration 010)
+
+        pgvector scores every in-scope row exactly by cosine distance (the
+        approximate HNSW scan would drop rows outside the conversation/org
+        filter), so only the top `limit` rows come back instead of every
+        vector in scope as JSON text to be parsed and scored here.
+        """
+        response = self.supabase.rpc("match_message_embeddings", {
+            "query_embedding": embedding,
+            "match_count": limit,
+            "match_threshold": threshold,
+            "p_conversation_id": conversation_id,
+            "p_org_id": org_id,
+        }).execute()
+
+        return [
+            SearchResult(
+                message_id=row.get("message_id"),
+                conversation_id=row.get("conversation_id"),
+                content=row.get("content"),
+                role=row.get("role"),
+                similarity_score=float(row.get("similarity", 0.0)),
+                created_at=row.get("created_at"),
+            )
+            for row in response.data or []
+        ]
+
     async def delete_embedding(self, message_id: str) -> bool:
         """
         Delete embedding for a message
@@ -410,19 +489,41 @@ class EmbeddingService:
         if len(message_ids) != len(texts):
             raise ValueError("message_ids and texts must be same length")
 
-        results = {}
+        results = {msg_id: False for msg_id in message_ids}
+        rows = []
 
-        for msg_id, text in zip(message_ids, texts):
-            try:
-                success = await self.embed_and_store(
-                    message_id=msg_id,
-                    conversation_id=conversation_id,
-                    text=text,
-                )
-                results[msg_id] = success
-            except Exception as e:
-                logger.error(f"Failed to embed message {msg_id}: {e}")
-                results[msg_id] = False
+        try:
+            embedded = await self.generate_embeddings(texts)
+        except Exception as e:
+            logger.error(f"Failed to embed messages: {e}")
+            return results
+
+        for msg_id, result in zip(message_ids, embedded):
+            if result is None:
+                logger.error(f"Failed to embed message {msg_id}")
+                continue
+
+            rows.append(self._embedding_row(
+                msg_id, conversation_id, result.embedding, result.model
+            ))
+
+        if not rows:
+            return results
+
+        # Bulk inserts instead of a round trip per message
+        try:
+            stored = insert_rows(self.supabase, "message_embeddings", rows)
+
+            if not stored:
+                raise ValueError("Failed to store embeddings")
+
+            for row in rows:
+                results[row["message_id"]] = True
+
+            logger.info(f"Stored {len(rows)} embeddings for conversation: {conversation_id}")
+
+        except Exception as e:
+            logger.error(f"Failed to store embedding batch: {e}")
 
         return results
 
@@ -451,17 +552,13 @@ class EmbeddingService:
                     "message": "Need at least 2 embeddings"
                 }
 
-            embeddings = [np.array(item["embedding"]) for item in response.data]
+            embeddings = [_as_vector(item["embedding"]) for item in response.data]
 
             # Compute pairwise similarities
             similarities = []
             for i in range(len(embeddings)):
                 for j in range(i + 1, len(embeddings)):
-                    sim = cosine_similarity(
-                        embeddings[i].reshape(1, -1),
-                        embeddings[j].reshape(1, -1)
-                    )[0][0]
-                    similarities.append(float(sim))
+                    similarities.append(_cosine_similarity(embeddings[i], embeddings[j]))
 
             avg_similarity = np.mean(similarities) if similarities else 0
 
@@ -1,4 +1,5 @@
 from typing import List
+import hashlib
 import numpy as np
 import os
 
@@ -10,33 +11,47 @@ except ImportError:
 
 EMBEDDING_SIZE = 1536
 
+_chroma_client = None
+_embeddings_collection = None
+
 # Initialize Chroma DB client
 def get_chroma_client():
+    """Create or return a cached Chroma DB HTTP client."""
+    global _chroma_client
     if chromadb is None:
         raise RuntimeError("Chroma DB client is not available")
-    chroma_host = os.getenv('CHROMA_HOST', 'localhost')
-    chroma_port = int(os.getenv('CHROMA_PORT', 8001))
-    client = chromadb.HttpClient(host=chroma_host, port=chroma_port)
-    return client
+    if _chroma_client is None:
+        chroma_host = os.getenv('CHROMA_HOST', 'localhost')
+        chroma_port = int(os.getenv('CHROMA_PORT', 8001))
+        _chroma_client = chromadb.HttpClient(host=chroma_host, port=chroma_port)
+    return _chroma_client
+
+
+def _get_embeddings_collection():
+    """Resolve the embeddings collection once instead of on every call."""
+    global _embeddings_collection
+    if _embeddings_collection is None:
+        _embeddings_collection = get_chroma_client().get_or_create_collection(name="embeddings")
+    return _embeddings_collection
 
 def generate_embedding(text: str) -> List[float]:
     """Generate an embedding vector for the supplied text using Chroma DB."""
-    client = get_chroma_client()
-    collection = client.get_or_create_collection(name="embeddings")
+    collection = _get_embeddings_collection()
     # Use a simple embedding model, assuming Chroma DB handles it
     # For now, we'll use a placeholder since Chroma DB doesn't generate embeddings directly
     # In practice, you might need to integrate with a local embedding model like sentence-transformers
     # For this refactor, I'll simulate it
-    import hashlib
     # Simple hash-based embedding for demo (replace with real model)
-    hash_obj = hashlib.md5(text.encode())
-    hash_int = int(hash_obj.hexdigest(), 16)
-    vector = [float((hash_int >> i) & 1) for i in range(EMBEDDING_SIZE)]
+    digest = hashlib.md5(text.encode(), usedforsecurity=False).digest()
+    # Bit i of the digest read as a big-endian int, without the hex round-trip
+    bits = np.unpackbits(np.frombuffer(digest[::-1], dtype=np.uint8), bitorder='little')
+    vector = np.zeros(EMBEDDING_SIZE)
+    vector[:bits.size] = bits
     # Normalize
     norm = np.linalg.norm(vector)
     if norm > 0:
-        vector = [v / norm for v in vector]
-    return vector
+        vector = vector / norm
+    return vector.tolist()
 
 
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
@@ -18,8 +18,8 @@ Usage:
 import os
 import json
 import logging
+import time
 from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
 from dataclasses import dataclass
 
 import httpx
@@ -205,15 +205,14 @@ class GoogleOAuthManager:
         Returns:
             AuthToken with JWT access token
         """
-        now = datetime.utcnow()
-        expires_at = now + timedelta(hours=expires_in_hours)
+        now = int(time.time())
 
         payload = {
             "sub": user_id,
             "org_id": org_id,
             "email": email,
-            "iat": int(now.timestamp()),
-            "exp": int(expires_at.timestamp()),
+            "iat": now,
+            "exp": now + expires_in_hours * 3600,
             "type": "access",
         }
 
@@ -289,57 +288,43 @@ class GoogleOAuthManager:
 
             supabase = supabase_client or get_supabase_client()
 
-            # Check if user already exists
-            user_response = supabase.table("users").select("*").eq(
+            # Check if user already exists (memberships embedded, so a
+            # returning user costs one round trip instead of two)
+            user_response = supabase.table("users").select(
+                "*, memberships(org_id, organizations(id, name, slug))"
+            ).eq(
                 "email", google_user.email
             ).execute()
 
+            org = None
             if user_response.data:
                 # Existing user
                 user = user_response.data[0]
+                memberships = user.pop("memberships", None) or []
                 is_new_user = False
                 logger.info(f"Existing user logged in: {user['id']}")
 
+                # 4. Get user's organization
+                if memberships:
+                    org = memberships[0]["organizations"]
+
             else:
-                # New user - create in users table
-                user_response = supabase.table("users").insert({
-                    "auth_sub": google_user.sub,
-                    "email": google_user.email,
-                    "display_name": google_user.name,
-                    "avatar_url": google_user.picture,
+                # New user - create the user, a default organization and the
+                # owner membership in one statement (see migration 009)
+                signup = supabase.rpc("create_user_with_org", {
+                    "p_auth_sub": google_user.sub,
+                    "p_email": google_user.email,
+                    "p_display_name": google_user.name,
+                    "p_avatar_url": google_user.picture,
+                    "p_org_name": f"{google_user.name}'s Organization",
+                    "p_org_slug": google_user.email.split("@")[0],
                 }).execute()
 
-                user = user_response.data[0]
+                user = signup.data["user"]
+                org = signup.data["org"]
                 is_new_user = True
                 logger.info(f"New user created: {user['id']}")
-
-            # 4. Get user's organization
-            membership_response = supabase.table("memberships").select(
-                "org_id, organizations(id, name, slug)"
-            ).eq("user_id", user["id"]).execute()
-
-            org = None
-            if membership_response.data:
-                org = membership_response.data[0]["organizations"]
-            else:
-                # New user - create default organization
-                if is_new_user:
-                    org_response = supabase.table("organizations").insert({
-                        "name": f"{google_user.name}'s Organization",
-                        "slug": google_user.email.split("@")[0],
-                        "billing_email": google_user.email,
-                    }).execute()
-
-                    org = org_response.data[0]
-
-                    # Add user as owner
-                    supabase.table("memberships").insert({
-                        "org_id": org["id"],
-                        "user_id": user["id"],
-                        "role": "owner",
-                    }).execute()
-
-                    logger.info(f"Default organization created: {org['id']}")
+                logger.info(f"Default organization created: {org['id']}")
 
             # 5. Generate JWT
             jwt_token = self.generate_jwt(
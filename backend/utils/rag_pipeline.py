@@ -26,6 +26,16 @@ from backend.utils.conversation_manager import get_conversation_manager, Message
 
 logger = logging.getLogger(__name__)
 
+# Below this length a chars/4 estimate is within a few tokens of a word count
+SHORT_TEXT_CHARS = 128
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used for context budgeting (not for billing)."""
+    if len(text) < SHORT_TEXT_CHARS:
+        return max(1, len(text) // 4)
+    return int(len(text.split()) * 1.3)
+
 
 @dataclass
 class RetrievedContext:
@@ -189,8 +199,8 @@ class RAGPipeline:
 Please provide a thoughtful response that considers the context above."""
 
             context_tokens = sum(
-                len(msg.content.split()) for msg in context.recent_messages
-            ) * 1.3  # Rough token estimate
+                estimate_tokens(msg.content) for msg in context.recent_messages
+            )
 
             return AugmentedPrompt(
                 original_query=query,
@@ -355,7 +365,7 @@ Please provide a thoughtful response that considers the context above."""
             # Count semantic results
             semantic_count = 0
             for msg in context.similar_messages:
-                token_estimate = len(msg.content.split()) * 1.3
+                token_estimate = estimate_tokens(msg.content)
                 if total_tokens + token_estimate <= max_tokens:
                     total_tokens += token_estimate
                     semantic_count += 1
@@ -365,7 +375,7 @@ Please provide a thoughtful response that considers the context above."""
             # Count recent messages
             recent_count = 0
             for msg in context.recent_messages:
-                token_estimate = len(msg.content.split()) * 1.3
+                token_estimate = estimate_tokens(msg.content)
                 if total_tokens + token_estimate <= max_tokens:
                     total_tokens += token_estimate
                     recent_count += 1
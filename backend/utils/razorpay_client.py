@@ -1,7 +1,11 @@
+import hashlib
+import hmac
 import os
 import razorpay
 
 _razorpay_client: razorpay.Client | None = None
+_webhook_hmac: hmac.HMAC | None = None
+_webhook_secret: str | None = None
 
 def get_razorpay_client() -> razorpay.Client:
     """Create or return a cached Razorpay client."""
@@ -13,3 +17,19 @@ def get_razorpay_client() -> razorpay.Client:
             raise RuntimeError("Razorpay credentials are not configured")
         _razorpay_client = razorpay.Client(auth=(key_id, key_secret))
     return _razorpay_client
+
+
+def verify_webhook_signature(body: bytes, signature: str, secret: str) -> bool:
+    """Check a Razorpay webhook signature (hex HMAC-SHA256 of the raw body)."""
+    global _webhook_hmac, _webhook_secret
+    if _webhook_hmac is None or secret != _webhook_secret:
+        # Keyed once; each webhook copies it instead of redoing the key schedule
+        _webhook_hmac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+        _webhook_secret = secret
+    try:
+        received = bytes.fromhex(signature)
+    except ValueError:
+        return False
+    mac = _webhook_hmac.copy()
+    mac.update(body)
+    return hmac.compare_digest(mac.digest(), received)
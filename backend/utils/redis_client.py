@@ -0,0 +1,133 @@
+"""Shared Redis connection pools for counters, budgets, and health checks."""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from typing import Optional, Union
+
+import redis
+import redis.asyncio
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional native JSON encoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_redis_pool: Optional[redis.ConnectionPool] = None
+_redis_client: Optional[redis.Redis] = None
+_async_redis_pool: Optional[redis.asyncio.ConnectionPool] = None
+_async_redis_client: Optional[redis.asyncio.Redis] = None
+
+
+# Stored for a cached "no row" result so misses skip JSON entirely
+CACHE_MISS_MARKER = ""
+
+
+def dumps_cache_value(value) -> Union[bytes, str]:
+    """Serialise a value for Redis, using orjson when installed."""
+    if value is None:
+        return CACHE_MISS_MARKER
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value)
+
+
+def loads_cache_value(raw: str):
+    """Inverse of dumps_cache_value (the miss marker loads as None)."""
+    if raw == CACHE_MISS_MARKER:
+        return None
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _keepalive_options() -> dict:
+    """Kernel keepalive probes: idle 60s, then every 10s, give up after 5"""
+    options = {}
+    for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 5)):
+        if hasattr(socket, name):  # not every platform exposes all three
+            options[getattr(socket, name)] = value
+    return options
+
+
+def _max_connections() -> int:
+    """
+    Split the REDIS_MAX_CONNECTIONS budget across uvicorn workers.
+
+    Every worker builds its own pools, so without this N workers could open
+    N times the configured connections against the server's maxclients.
+    """
+    budget = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    per_worker = max(2, budget // workers)
+    logger.info(
+        "Redis pool: %d connections per worker (%d budget / %d workers)",
+        per_worker, budget, workers,
+    )
+    return per_worker
+
+
+def _pool_options() -> dict:
+    return {
+        "max_connections": _max_connections(),
+        "decode_responses": True,
+        # The kernel detects dead peers via keepalive probes, so the extra
+        # PING round trip is only needed for connections idle past that
+        "socket_keepalive": True,
+        "socket_keepalive_options": _keepalive_options(),
+        "health_check_interval": int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "60")),
+        "retry_on_timeout": False,
+    }
+
+
+def _build_pool(pool_class):
+    options = _pool_options()
+
+    url = os.getenv("REDIS_URL")
+    if url:
+        return pool_class.from_url(url, **options)
+
+    return pool_class(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        **options,
+    )
+
+
+def _create_redis_pool() -> redis.ConnectionPool:
+    """Build one explicit pool so every caller reuses keepalive connections."""
+    return _build_pool(redis.ConnectionPool)
+
+
+def get_redis_client() -> redis.Redis:
+    """Return a cached Redis client backed by the shared connection pool."""
+    global _redis_pool, _redis_client
+    if _redis_client is None:
+        _redis_pool = _create_redis_pool()
+        _redis_client = redis.Redis(connection_pool=_redis_pool)
+    return _redis_client
+
+
+def get_async_redis_client() -> redis.asyncio.Redis:
+    """Return a cached asyncio Redis client for use inside request handlers."""
+    global _async_redis_pool, _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_pool = _build_pool(redis.asyncio.ConnectionPool)
+        _async_redis_client = redis.asyncio.Redis(connection_pool=_async_redis_pool)
+    return _async_redis_client
+
+
+async def warm_async_redis_pool(connections: Optional[int] = None) -> None:
+    """
+    Open pool connections before traffic arrives.
+
+    Concurrent PINGs each check out their own connection, so the first burst
+    of requests finds them already connected instead of paying the handshake.
+    """
+    count = connections or int(os.getenv("REDIS_WARM_CONNECTIONS", "10"))
+    client = get_async_redis_client()
+    await asyncio.gather(*(client.ping() for _ in range(count)))
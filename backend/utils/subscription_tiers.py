@@ -311,6 +311,21 @@ SUBSCRIPTION_TIERS = {
 TIER_NAMES = {v['name']: k for k, v in SUBSCRIPTION_TIERS.items()}
 TIER_PRICES = {k: v['price_inr'] for k, v in SUBSCRIPTION_TIERS.items()}
 
+# One bit per feature flag, and one packed int of enabled flags per tier, so
+# access checks are a single AND instead of two nested dict lookups
+FEATURE_BITS = {
+    feature: 1 << index
+    for index, feature in enumerate(sorted({
+        feature
+        for tier in SUBSCRIPTION_TIERS.values()
+        for feature in tier.get('features', {})
+    }))
+}
+TIER_FEATURE_MASKS = {
+    k: sum(FEATURE_BITS[f] for f, enabled in v.get('features', {}).items() if enabled)
+    for k, v in SUBSCRIPTION_TIERS.items()
+}
+
 
 def get_tier_config(tier_key: str) -> dict:
     """Get full tier configuration by key (breeze, glide, soar)"""
@@ -322,8 +337,10 @@ def get_tier_config(tier_key: str) -> dict:
 
 def validate_tier_access(tier_key: str, feature: str) -> bool:
     """Check if tier has access to a feature"""
-    config = get_tier_config(tier_key)
-    return config.get('features', {}).get(feature, False)
+    tier_key = tier_key.lower()
+    if tier_key not in TIER_FEATURE_MASKS:
+        get_tier_config(tier_key)  # raises ValueError for unknown tiers
+    return bool(TIER_FEATURE_MASKS[tier_key] & FEATURE_BITS.get(feature, 0))
 
 
 def get_capacity_limit(tier_key: str, capacity_type: str) -> int | float:
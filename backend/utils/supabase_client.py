@@ -34,15 +34,17 @@ class InMemoryQuery:
         self._single = False
         self._operation: Optional[str] = None
         self._payload: Any = None
+        self._returning = "representation"
 
     # Query modifiers -----------------------------------------------------
     def select(self, *_: Any) -> "InMemoryQuery":
         self._operation = "select"
         return self
 
-    def insert(self, payload: Any) -> "InMemoryQuery":
+    def insert(self, payload: Any, returning: str = "representation") -> "InMemoryQuery":
         self._operation = "insert"
         self._payload = payload
+        self._returning = returning
         return self
 
     def update(self, payload: Dict[str, Any]) -> "InMemoryQuery":
@@ -86,6 +88,8 @@ class InMemoryQuery:
                 record.setdefault("id", str(uuid.uuid4()))
                 table.append(record)
                 inserted.append(record)
+            if self._returning == "minimal":
+                return SimpleNamespace(data=[])
             return SimpleNamespace(data=inserted)
 
         if self._operation == "update":
@@ -146,3 +150,37 @@ def get_supabase_client() -> Client:
     if _supabase_client is None:
         _supabase_client = _create_supabase_client()
     return _supabase_client
+
+
+# Rows per bulk INSERT; keeps each request comfortably under PostgREST's
+# body size limit for wide rows such as embeddings
+INSERT_BATCH_SIZE = int(os.getenv("SUPABASE_INSERT_BATCH_SIZE", "500"))
+
+
+def insert_rows(
+    client: Client,
+    table: str,
+    rows: Iterable[Dict[str, Any]],
+    returning: str = "representation",
+    batch_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Insert many rows with as few requests as possible.
+
+    PostgREST bulk inserts need every object to carry the same keys, so rows
+    are grouped by column set and each group is sent as multi-row INSERTs of
+    up to ``batch_size`` rows. Returned rows are ordered group by group.
+    """
+    size = batch_size or INSERT_BATCH_SIZE
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    inserted: List[Dict[str, Any]] = []
+    for group in groups.values():
+        for start in range(0, len(group), size):
+            response = client.table(table).insert(
+                group[start:start + size], returning=returning
+            ).execute()
+            inserted.extend(response.data or [])
+    return inserted
@@ -0,0 +1,30 @@
+-- ==========================================
+-- Migration: Feature Usage Counts
+-- ==========================================
+-- Returns a business's ICP and move counts in one round trip
+-- Used by CostControllerV2.get_feature_limits
+
+-- Run with:
+--   psql -U raptorflow -d raptorflow_prod < migrations/002_feature_usage_counts.sql
+
+-- ==========================================
+-- Functions
+-- ==========================================
+
+CREATE OR REPLACE FUNCTION get_feature_usage(p_business_id UUID)
+RETURNS TABLE (icp_count BIGINT, move_count BIGINT) AS $$
+    SELECT
+        (SELECT COUNT(*) FROM icps WHERE business_id = p_business_id),
+        (SELECT COUNT(*) FROM moves WHERE business_id = p_business_id);
+$$ LANGUAGE sql STABLE;
+
+-- ==========================================
+-- Migration Status
+-- ==========================================
+-- Log migration completion
+
+INSERT INTO schema_migrations (name, executed_at)
+VALUES ('002_feature_usage_counts', NOW())
+ON CONFLICT (name) DO UPDATE SET executed_at = NOW();
+
+COMMIT;
@@ -0,0 +1,34 @@
+-- ==========================================
+-- Migration: Conversation Title Search Index
+-- ==========================================
+-- Trigram index so ILIKE '%query%' title search can use an index
+-- instead of scanning every conversation in the table
+
+-- Run with:
+--   psql -U raptorflow -d raptorflow_prod < migrations/003_conversation_title_trgm.sql
+
+-- ==========================================
+-- Extensions
+-- ==========================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ==========================================
+-- Indexes
+-- ==========================================
+-- Combined with idx_conversations_org_id via a bitmap AND for
+-- the org-scoped search in ConversationManager.search_conversations
+
+CREATE INDEX IF NOT EXISTS idx_conversations_title_trgm
+    ON conversations USING gin (title gin_trgm_ops);
+
+-- ==========================================
+-- Migration Status
+-- ==========================================
+-- Log migration completion
+
+INSERT INTO schema_migrations (name, executed_at)
+VALUES ('003_conversation_title_trgm', NOW())
+ON CONFLICT (name) DO UPDATE SET executed_at = NOW();
+
+COMMIT;
@@ -0,0 +1,36 @@
+-- ==========================================
+-- Migration: Atomic Conversation Counters
+-- ==========================================
+-- Adds message/token increments to a conversation in a single
+-- UPDATE ... RETURNING, replacing the read-modify-write round trips
+
+-- Run with:
+--   psql -U raptorflow -d raptorflow_prod < migrations/004_increment_conversation_counts.sql
+
+-- ==========================================
+-- Functions
+-- ==========================================
+
+CREATE OR REPLACE FUNCTION increment_conversation_counts(
+    p_conversation_id UUID,
+    p_message_count INT,
+    p_token_count INT
+)
+RETURNS TABLE (message_count INT, token_count INT) AS $$
+    UPDATE conversations
+    SET message_count = conversations.message_count + p_message_count,
+        token_count = conversations.token_count + p_token_count
+    WHERE id = p_conversation_id
+    RETURNING conversations.message_count, conversations.token_count;
+$$ LANGUAGE sql VOLATILE;
+
+-- ==========================================
+-- Migration Status
+-- ==========================================
+-- Log migration completion
+
+INSERT INTO schema_migrations (name, executed_at)
+VALUES ('004_increment_conversation_counts', NOW())
+ON CONFLICT (name) DO UPDATE SET executed_at = NOW();
+
+COMMIT;
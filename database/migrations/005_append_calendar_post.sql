@@ -0,0 +1,55 @@
+-- ==========================================
+-- Migration: Server-side Calendar Post Append
+-- ==========================================
+-- Appends a post to a move's calendar JSONB in place, so trend
+-- injection no longer rewrites the whole calendar from a stale copy
+
+-- Run with:
+--   psql -U raptorflow -d raptorflow_prod < migrations/005_append_calendar_post.sql
+
+-- ==========================================
+-- Functions
+-- ==========================================
+-- p_day_index is zero-based; an index outside the current calendar
+-- appends a new day holding just this post
+
+CREATE OR REPLACE FUNCTION append_calendar_post(
+    p_move_id UUID,
+    p_day_index INT,
+    p_post JSONB
+)
+RETURNS VOID AS $$
+    UPDATE moves
+    SET calendar = CASE
+        WHEN p_day_index >= 0
+             AND p_day_index < jsonb_array_length(calendar->'calendar')
+        THEN jsonb_set(
+            calendar,
+            ARRAY['calendar', p_day_index::text, 'posts'],
+            COALESCE(calendar->'calendar'->p_day_index->'posts', '[]'::jsonb)
+                || jsonb_build_array(p_post)
+        )
+        ELSE jsonb_set(
+            calendar,
+            '{calendar}',
+            COALESCE(calendar->'calendar', '[]'::jsonb) || jsonb_build_array(
+                jsonb_build_object(
+                    'day', COALESCE(jsonb_array_length(calendar->'calendar'), 0) + 1,
+                    'posts', jsonb_build_array(p_post)
+                )
+            )
+        )
+    END
+    WHERE id = p_move_id;
+$$ LANGUAGE sql VOLATILE;
+
+-- ==========================================
+-- Migration Status
+-- ==========================================
+-- Log migration completion
+
+INSERT INTO schema_migrations (name, executed_at)
+VALUES ('005_append_calendar_post', NOW())
+ON CONFLICT (name) DO UPDATE SET executed_at = NOW();
+
+COMMIT;
@@ -0,0 +1,29 @@
+-- ==========================================
+-- Migration: Conversation Listing Index
+-- ==========================================
+-- Composite index matching ConversationManager.list_conversations:
+--   WHERE org_id = ? AND user_id = ? AND status = ?
+--   ORDER BY created_at DESC, id DESC
+-- so the planner walks rows already in order instead of sorting them.
+-- id is the keyset tie-breaker for rows sharing a created_at
+
+-- Run with:
+--   psql -U raptorflow -d raptorflow_prod < migrations/006_conversation_list_index.sql
+
+-- ==========================================
+-- Indexes
+-- ==========================================
+
+CREATE INDEX IF NOT EXISTS idx_conversations_org_user_status_created
+    ON conversations(org_id, user_id, status, created_at DESC, id DESC);
+
+-- ==========================================
+-- Migration Status
+-- ==========================================
+-- Log migration completion
+
+INSERT INTO schema_migrations (name, executed_at)
+VALUES ('006_conversation_list_index', NOW())
+ON CONFLICT (name) DO UPDATE SET executed_at = NOW();
+
+COMMIT;
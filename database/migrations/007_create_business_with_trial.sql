@@ -0,0 +1,48 @@
+-- ==========================================
+-- Migration: Business Intake Unit of Work
+-- ==========================================
+-- Creates a business and its trial subscription in one transaction
+-- and one round trip, so intake commits once and can no longer leave
+-- a business without a subscription
+
+-- Run with:
+--   psql -U raptorflow -d raptorflow_prod < migrations/007_create_business_with_trial.sql
+
+-- ==========================================
+-- Functions
+-- ==========================================
+-- Inputs are JSON objects keyed by column name; jsonb_populate_record
+-- casts each field to the column's type, and columns left out keep
+-- their defaults
+
+CREATE OR REPLACE FUNCTION create_business_with_trial(
+    p_business JSONB,
+    p_subscription JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_business businesses;
+BEGIN
+    INSERT INTO businesses (name, industry, location, description, goals, user_id)
+    SELECT b.name, b.industry, b.location, b.description, b.goals, b.user_id
+    FROM jsonb_populate_record(NULL::businesses, p_business) b
+    RETURNING * INTO v_business;
+
+    INSERT INTO subscriptions (business_id, tier, max_icps, max_moves, status, user_id)
+    SELECT v_business.id, s.tier, s.max_icps, s.max_moves, s.status, s.user_id
+    FROM jsonb_populate_record(NULL::subscriptions, p_subscription) s;
+
+    RETURN to_jsonb(v_business);
+END;
+$$ LANGUAGE plpgsql VOLATILE;
+
+-- ==========================================
+-- Migration Status
+-- ==========================================
+-- Log migration completion
+
+INSERT INTO schema_migrations (name, executed_at)
+VALUES ('007_create_business_with_trial', NOW())
+ON CONFLICT (name) DO UPDATE SET executed_at = NOW();
+
+COMMIT;
@@ -0,0 +1,54 @@
+-- ==========================================
+-- Migration: Server-side updated_at
+-- ==========================================
+-- Tables from 001 default updated_at to NOW() on insert but had no
+-- update trigger, so edits, soft deletes and counter increments left
+-- it stale. Let Postgres maintain it instead of the application
+
+-- Run with:
+--   psql -U raptorflow -d raptorflow_prod < migrations/008_conversation_updated_at_triggers.sql
+
+-- ==========================================
+-- Functions
+-- ==========================================
+-- Same definition as schema-production.sql; repeated so this
+-- migration also applies to databases built from migrations only
+
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- ==========================================
+-- Triggers
+-- ==========================================
+
+DROP TRIGGER IF EXISTS update_oauth_accounts_updated_at ON oauth_accounts;
+CREATE TRIGGER update_oauth_accounts_updated_at BEFORE UPDATE ON oauth_accounts
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_conversations_updated_at ON conversations;
+CREATE TRIGGER update_conversations_updated_at BEFORE UPDATE ON conversations
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_conversation_messages_updated_at ON conversation_messages;
+CREATE TRIGGER update_conversation_messages_updated_at BEFORE UPDATE ON conversation_messages
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_conversation_analytics_updated_at ON conversation_analytics;
+CREATE TRIGGER update_conversation_analytics_updated_at BEFORE UPDATE ON conversation_analytics
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- ==========================================
+-- Migration Status
+-- ==========================================
+-- Log migration completion
+
+INSERT INTO schema_migrations (name, executed_at)
+VALUES ('008_conversation_updated_at_triggers', NOW())
+ON CONFLICT (name) DO UPDATE SET executed_at = NOW();
+
+COMMIT;
@@ -0,0 +1,71 @@
+-- ==========================================
+-- Migration: Signup in One Statement
+-- ==========================================
+-- Creates a new user, their default organization and the owner
+-- membership in one function call: one round trip and one
+-- transaction instead of three separate inserts.
+--
+-- The requested org slug is derived from the email's local part, which
+-- is not unique across domains (john@gmail.com, john@acme.com). On a
+-- slug conflict the org insert retries with a short suffix derived from
+-- the new user's id, so a taken slug never rolls back the whole signup
+
+-- Run with:
+--   psql -U raptorflow -d raptorflow_prod < migrations/009_create_user_with_org.sql
+
+-- ==========================================
+-- Functions
+-- ==========================================
+
+CREATE OR REPLACE FUNCTION create_user_with_org(
+    p_auth_sub TEXT,
+    p_email TEXT,
+    p_display_name TEXT,
+    p_avatar_url TEXT,
+    p_org_name TEXT,
+    p_org_slug TEXT
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_user users;
+    v_org organizations;
+    v_slug TEXT := p_org_slug;
+    v_attempt INT := 0;
+BEGIN
+    INSERT INTO users (auth_sub, email, display_name, avatar_url)
+    VALUES (p_auth_sub, p_email, p_display_name, p_avatar_url)
+    RETURNING * INTO v_user;
+
+    LOOP
+        BEGIN
+            INSERT INTO organizations (name, slug, billing_email)
+            VALUES (p_org_name, v_slug, p_email)
+            RETURNING * INTO v_org;
+            EXIT;
+        EXCEPTION WHEN unique_violation THEN
+            -- Bounded so an unrelated unique violation still surfaces
+            v_attempt := v_attempt + 1;
+            IF v_attempt > 5 THEN
+                RAISE;
+            END IF;
+            v_slug := p_org_slug || '-' || substr(md5(v_user.id::text || v_attempt), 1, 6);
+        END;
+    END LOOP;
+
+    INSERT INTO memberships (org_id, user_id, role)
+    VALUES (v_org.id, v_user.id, 'owner');
+
+    RETURN jsonb_build_object('user', to_jsonb(v_user), 'org', to_jsonb(v_org));
+END;
+$$ LANGUAGE plpgsql VOLATILE;
+
+-- ==========================================
+-- Migration Status
+-- ==========================================
+-- Log migration completion
+
+INSERT INTO schema_migrations (name, executed_at)
+VALUES ('009_create_user_with_org', NOW())
+ON CONFLICT (name) DO UPDATE SET executed_at = NOW();
+
+COMMIT;
@@ -0,0 +1,79 @@
+-- ==========================================
+-- Migration: Server-side Message Embedding Search
+-- ==========================================
+-- Ranks message embeddings inside Postgres with pgvector's cosine
+-- distance operator, so searches return only the top matches instead
+-- of every 1536-dim vector as JSON text for Python to score
+-- Used by EmbeddingService.semantic_search / semantic_search_global
+
+-- Run with:
+--   psql -U raptorflow -d raptorflow_prod < migrations/010_match_message_embeddings.sql
+
+-- ==========================================
+-- Functions
+-- ==========================================
+
+-- Scope by conversation, by organization, or both (NULL skips a filter).
+--
+-- Scoring is exact on purpose. An HNSW scan ordered by embedding <=> q
+-- only visits hnsw.ef_search candidates across the whole table and
+-- applies the scope filters afterwards, so a single conversation could
+-- get fewer than match_count rows, or none. The MATERIALIZED CTE scores
+-- every in-scope row (the same rows the old Python path scored) and the
+-- outer ORDER BY sorts on the computed distance, so the planner cannot
+-- swap in the approximate index scan. Cost is linear in the scope's
+-- size, which is small per conversation and per org; the vectors no
+-- longer leave the database. Revisit with hnsw.iterative_scan
+-- (pgvector 0.8+) if org-wide scopes grow large
+CREATE OR REPLACE FUNCTION match_message_embeddings(
+    query_embedding VECTOR(1536),
+    match_count INT DEFAULT 5,
+    match_threshold FLOAT DEFAULT 0.5,
+    p_conversation_id UUID DEFAULT NULL,
+    p_org_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    message_id UUID,
+    conversation_id UUID,
+    role TEXT,
+    content TEXT,
+    created_at TIMESTAMPTZ,
+    similarity FLOAT
+) AS $$
+    WITH scored AS MATERIALIZED (
+        SELECT
+            m.id AS message_id,
+            e.conversation_id,
+            m.role,
+            m.content,
+            m.created_at,
+            e.embedding <=> query_embedding AS distance
+        FROM message_embeddings e
+        JOIN conversation_messages m ON m.id = e.message_id
+        JOIN conversations c ON c.id = e.conversation_id
+        WHERE (p_conversation_id IS NULL OR e.conversation_id = p_conversation_id)
+          AND (p_org_id IS NULL OR c.org_id = p_org_id)
+    )
+    SELECT
+        message_id,
+        conversation_id,
+        role,
+        content,
+        created_at,
+        1 - distance
+    FROM scored
+    WHERE 1 - distance >= match_threshold
+    ORDER BY distance
+    LIMIT match_count;
+$$ LANGUAGE sql STABLE;
+
+-- ==========================================
+-- Migration Status
+-- ==========================================
+-- Log migration completion
+
+INSERT INTO schema_migrations (name, executed_at)
+VALUES ('010_match_message_embeddings', NOW())
+ON CONFLICT (name) DO UPDATE SET executed_at = NOW();
+
+COMMIT;
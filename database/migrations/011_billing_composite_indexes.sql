@@ -0,0 +1,42 @@
+-- ==========================================
+-- Migration: Billing Composite Indexes
+-- ==========================================
+-- Per-org billing listings filter on org_id and order by time:
+--   payments        WHERE org_id = ? ORDER BY created_at DESC
+--   ledger_entries  WHERE org_id = ? ORDER BY entry_at DESC, account
+-- Composite indexes return those rows pre-sorted instead of an org_id
+-- scan followed by an in-memory sort. Single-column indexes already
+-- covered by a composite's leading column or a UNIQUE constraint are
+-- dropped so inserts stop maintaining them
+
+-- Run with:
+--   psql -U raptorflow -d raptorflow_prod < migrations/011_billing_composite_indexes.sql
+
+-- ==========================================
+-- Indexes
+-- ==========================================
+
+CREATE INDEX IF NOT EXISTS idx_payments_org_created
+    ON payments(org_id, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_ledger_org_entry_account
+    ON ledger_entries(org_id, entry_at DESC, account);
+
+-- Covered by the composites above
+DROP INDEX IF EXISTS idx_payments_org_id;
+DROP INDEX IF EXISTS idx_ledger_org_id;
+
+-- Covered by the UNIQUE constraints on the columns
+DROP INDEX IF EXISTS idx_payments_provider_payment_id;
+DROP INDEX IF EXISTS idx_subscriptions_org_id;
+
+-- ==========================================
+-- Migration Status
+-- ==========================================
+-- Log migration completion
+
+INSERT INTO schema_migrations (name, executed_at)
+VALUES ('011_billing_composite_indexes', NOW())
+ON CONFLICT (name) DO UPDATE SET executed_at = NOW();
+
+COMMIT;
@@ -137,7 +137,6 @@ CREATE TABLE subscriptions (
     UNIQUE(org_id)
 );
 
-CREATE INDEX idx_subscriptions_org_id ON subscriptions(org_id);
 CREATE INDEX idx_subscriptions_status ON subscriptions(status);
 CREATE INDEX idx_subscriptions_period_end ON subscriptions(current_period_end);
 
@@ -172,8 +171,7 @@ CREATE TABLE payments (
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
-CREATE INDEX idx_payments_org_id ON payments(org_id);
-CREATE INDEX idx_payments_provider_payment_id ON payments(provider_payment_id);
+CREATE INDEX idx_payments_org_created ON payments(org_id, created_at DESC);
 CREATE INDEX idx_payments_status ON payments(status);
 CREATE INDEX idx_payments_created_at ON payments(created_at);
 
@@ -203,7 +201,7 @@ CREATE TABLE ledger_entries (
     CONSTRAINT chk_direction CHECK (direction IN ('DR', 'CR'))
 );
 
-CREATE INDEX idx_ledger_org_id ON ledger_entries(org_id);
+CREATE INDEX idx_ledger_org_entry_account ON ledger_entries(org_id, entry_at DESC, account);
 CREATE INDEX idx_ledger_entry_at ON ledger_entries(entry_at);
 CREATE INDEX idx_ledger_account ON ledger_entries(account);
 